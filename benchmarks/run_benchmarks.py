@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+""" Benchmarks create_django_project.py with fake pipenv, npm and npx
+
+The stubs of stub_tools.py sleep for configurable delays instead of talking to
+a registry, so the numbers show the time of the scaffolder itself (and how
+much of the tool time runs in parallel) independent of the network.
+
+For every combination of django-browser-reload, AlpineJS and HTMX, the full
+script is run --repeat times in a fresh folder. The median of the total time,
+the time of every step (from --trace), the number of subprocesses and the
+number of files created is reported.
+"""
+
+# pylint: disable=C0103
+# pylint: disable=C0116
+
+import argparse
+import itertools
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(os.path.dirname(BENCHMARK_DIR), "create_django_project.py")
+OPTIONS = ["browser-reload", "alpine", "htmx"]
+
+
+def install_stubs(bin_dir):
+    os.makedirs(bin_dir)
+    stub_tools = os.path.join(BENCHMARK_DIR, "stub_tools.py")
+    for tool in ("pipenv", "npm", "npx"):
+        os.symlink(stub_tools, os.path.join(bin_dir, tool))
+
+
+def count_files(folder):
+    files = 0
+    for _, dirs, names in os.walk(folder):
+        files += len(dirs) + len(names)
+    return files
+
+
+def run_once(combination, args):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bin_dir = os.path.join(temp_dir, "bin")
+        install_stubs(bin_dir)
+        trace_file = os.path.join(temp_dir, "trace.json")
+        stub_log = os.path.join(temp_dir, "stub_calls.log")
+        env = dict(
+            os.environ,
+            PATH=bin_dir + os.pathsep + os.environ["PATH"],
+            STUB_LOG=stub_log,
+            STUB_DELAY_PIPENV=str(args.pipenv_delay),
+            STUB_DELAY_NPM=str(args.npm_delay),
+            STUB_DELAY_NPX=str(args.npx_delay),
+        )
+        lock_args = []
+        if args.django_version is not None:
+            # the lock templates pin Django, only a resolving run uses this version
+            env["STUB_DJANGO_VERSION"] = args.django_version
+            lock_args = ["--no-lock-templates"]
+        command = [
+            sys.executable,
+            SCRIPT,
+            "--cache-dir",
+            os.path.join(temp_dir, "cache"),
+            "--folder",
+            "bench",
+            "--project",
+            "core",
+            "--app",
+            "pages",
+            "--trace",
+            trace_file,
+            *(
+                f"--{option}" if enabled else f"--no-{option}"
+                for option, enabled in zip(OPTIONS, combination)
+            ),
+            *lock_args,
+            *shlex.split(args.script_args),
+        ]
+        start = time.perf_counter()
+        result = subprocess.run(
+            command,
+            cwd=temp_dir,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            check=False,
+        )
+        total = time.perf_counter() - start
+        if result.returncode != 0:
+            print(result.stdout)
+            sys.exit(f"Benchmark run failed: {' '.join(command)}")
+
+        with open(trace_file, "r", encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+        steps = {e["name"]: e["dur"] / 1e6 for e in events if e["cat"] == "step"}
+        with open(stub_log, "r", encoding="utf-8") as f:
+            stub_calls = [json.loads(line) for line in f]
+        return {
+            "total": total,
+            "steps": steps,
+            # the sum of all steps is what a sequential run would have needed
+            "parallelism": sum(steps.values()) / total,
+            "subprocesses": len(stub_calls),
+            "commands": sum(1 for e in events if e["cat"] == "command"),
+            "files": count_files(os.path.join(temp_dir, "bench")),
+            "bytes_written": sum(
+                e["args"].get("bytes_written", 0) for e in events if e["cat"] == "step"
+            ),
+        }
+
+
+def median_result(runs):
+    step_names = list(runs[0]["steps"])
+    return {
+        "total": statistics.median(run["total"] for run in runs),
+        "steps": {
+            name: statistics.median(run["steps"].get(name, 0) for run in runs)
+            for name in step_names
+        },
+        "parallelism": statistics.median(run["parallelism"] for run in runs),
+        "subprocesses": runs[0]["subprocesses"],
+        "commands": runs[0]["commands"],
+        "files": runs[0]["files"],
+        "bytes_written": statistics.median(run["bytes_written"] for run in runs),
+    }
+
+
+def label(combination):
+    enabled = [option for option, on in zip(OPTIONS, combination) if on]
+    return "+".join(enabled) if enabled else "tailwind only"
+
+
+def print_results(results):
+    label_width = max(len(name) for name in results)
+    print()
+    print(
+        f"{'Options':<{label_width}}  {'Total':>7}  {'Parallel':>8}  "
+        f"{'Procs':>5}  {'Cmds':>4}  {'Files':>5}  {'Written':>9}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<{label_width}}  {result['total']:>6.2f}s  {result['parallelism']:>7.2f}x  "
+            f"{result['subprocesses']:>5}  {result['commands']:>4}  {result['files']:>5}  "
+            f"{result['bytes_written'] / 1024:>6.0f} KB"
+        )
+
+    step_names = []
+    for result in results.values():
+        step_names += [name for name in result["steps"] if name not in step_names]
+    step_width = max(len("Step"), *(len(name) for name in step_names))
+    print()
+    print("Median time per step (seconds), one column per option combination:")
+    print(
+        f"{'Step':<{step_width}}  "
+        + "  ".join(f"{i + 1:>6}" for i in range(len(results)))
+    )
+    for step_name in step_names:
+        print(
+            f"{step_name:<{step_width}}  "
+            + "  ".join(
+                (
+                    f"{result['steps'][step_name]:>6.2f}"
+                    if step_name in result["steps"]
+                    else f"{'-':>6}"
+                )
+                for result in results.values()
+            )
+        )
+    for i, name in enumerate(results):
+        print(f"  {i + 1}: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks create_django_project.py with fake pipenv, npm and npx"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per combination")
+    parser.add_argument(
+        "--pipenv-delay", type=float, default=0.5, help="seconds per pipenv call"
+    )
+    parser.add_argument(
+        "--npm-delay", type=float, default=0.5, help="seconds per npm call"
+    )
+    parser.add_argument(
+        "--npx-delay", type=float, default=0.2, help="seconds per npx call"
+    )
+    parser.add_argument(
+        "--django-version",
+        help="Django version the fake pipenv locks, the script then resolves the "
+        "packages with --no-lock-templates instead of installing the lock templates",
+    )
+    parser.add_argument(
+        "--script-args",
+        default="",
+        help="more arguments for create_django_project.py, e.g. --script-args=--shared-store",
+    )
+    parser.add_argument("--output", help="save all results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for combination in itertools.product([False, True], repeat=len(OPTIONS)):
+        runs = [run_once(combination, args) for _ in range(args.repeat)]
+        results[label(combination)] = median_result(runs)
+        print(f"{label(combination)}: {results[label(combination)]['total']:.2f}s")
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"Results saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+"""Fake pipenv, npm and npx for the benchmarks
+
+run_benchmarks.py links this script as 'pipenv', 'npm' and 'npx' into a folder in
+front of PATH. It writes the files the real tools write (Pipfile, Pipfile.lock,
+manage.py, package.json, package-lock.json, node_modules, tailwind.config.js,
+the tarballs of 'npm pack'), but never touches the network, so the benchmarks
+only measure the scaffolder.
+
+Environment variables:
+* STUB_DELAY_PIPENV, STUB_DELAY_NPM, STUB_DELAY_NPX: seconds every call sleeps
+* STUB_DJANGO_VERSION: Django version written to Pipfile.lock (default 5.0.7), only
+  used when the script resolves (--no-lock-templates)
+* STUB_LOG: file every call is appended to as a JSON line
+"""
+
+# pylint: disable=C0103
+# pylint: disable=C0116
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import time
+
+STUB_PACKAGE_VERSION = "1.0.0"
+
+# files the scaffolder copies out of node_modules
+DIST_FILES = {
+    "alpinejs": ["dist/cdn.min.js"],
+    "htmx.org": ["dist/htmx.min.js"],
+}
+
+# postcss-cli provides 'postcss', it copies its input to its output here
+BIN_SCRIPTS = {
+    "postcss-cli": (
+        "postcss",
+        '#!/bin/sh\nwhile [ "$1" != "-o" ]; do in="$1"; shift; done\ncp "$in" "$2"\n',
+    ),
+    "tailwindcss": ("tailwindcss", "#!/bin/sh\nexit 0\n"),
+    "npm-watch": ("npm-watch", "#!/bin/sh\nexit 0\n"),
+}
+
+TAILWIND_CONFIG = """/** @type {import('tailwindcss').Config} */
+module.exports = {
+  content: [],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+}
+"""
+
+SETTINGS = """from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SECRET_KEY = "django-insecure-stub"
+
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+ROOT_URLCONF = "{project}.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {},
+    },
+]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+    }
+}
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_TZ = True
+
+STATIC_URL = "static/"
+"""
+
+URLS = """from django.contrib import admin
+from django.urls import path
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+]
+"""
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    write(path, json.dumps(data, indent=2) + "\n")
+
+
+def package_name(spec):
+    """'alpinejs@3.14.1' -> 'alpinejs', '@scope/name@1' -> '@scope/name'"""
+    at = spec.rfind("@")
+    return spec[:at] if at > 0 else spec
+
+
+def pipenv(args):
+    if args[:1] == ["install"]:
+        packages = [arg for arg in args[1:] if not arg.startswith("-")]
+        pipfile = "[packages]\n" + "".join(f'{p} = "*"\n' for p in packages)
+        write("Pipfile", pipfile)
+        lock = {"_meta": {"hash": {"sha256": "stub"}}, "default": {}, "develop": {}}
+        for package in packages:
+            version = STUB_PACKAGE_VERSION
+            if package == "django":
+                version = os.environ.get("STUB_DJANGO_VERSION", "5.0.7")
+            lock["default"][package.lower()] = {"version": f"=={version}"}
+        write_json("Pipfile.lock", lock)
+    elif args[:1] == ["--venv"]:
+        print(os.path.join(os.getcwd(), ".venv"))
+    elif args[:3] == ["run", "django-admin", "startproject"]:
+        project = args[3]
+        write("manage.py", f"# manage.py for {project}.settings\n")
+        write(os.path.join(project, "__init__.py"), "")
+        write(
+            os.path.join(project, "settings.py"), SETTINGS.replace("{project}", project)
+        )
+        write(os.path.join(project, "urls.py"), URLS)
+    elif args[:4] == ["run", "python", "manage.py", "startapp"]:
+        app = args[4]
+        write(os.path.join(app, "__init__.py"), "")
+        write(os.path.join(app, "migrations", "__init__.py"), "")
+        camel_case = "".join(x for x in app.title() if x != "_")
+        write(
+            os.path.join(app, "apps.py"),
+            f"from django.apps import AppConfig\n\n\nclass {camel_case}Config(AppConfig):\n"
+            f"    name = '{app}'\n",
+        )
+    # 'sync' and everything else: the environment already exists
+    return 0
+
+
+def install_package(name):
+    package_dir = os.path.join("node_modules", name)
+    write_json(
+        os.path.join(package_dir, "package.json"),
+        {"name": name, "version": STUB_PACKAGE_VERSION},
+    )
+    for dist_file in DIST_FILES.get(name, ["index.js"]):
+        write(os.path.join(package_dir, dist_file), f"/* {name} {dist_file} */\n")
+    if name in BIN_SCRIPTS:
+        bin_name, script = BIN_SCRIPTS[name]
+        bin_path = os.path.join("node_modules", ".bin", bin_name)
+        write(bin_path, script)
+        os.chmod(bin_path, 0o755)
+
+
+def pack(spec, destination):
+    """A tarball like the one of the registry, all files below package/"""
+    name = package_name(spec)
+    version = spec[len(name) + 1 :] or STUB_PACKAGE_VERSION
+    tarball_path = os.path.join(destination, f"{name}-{version}.tgz")
+    with tarfile.open(tarball_path, "w:gz") as tarball:
+        for dist_file in DIST_FILES.get(name, ["index.js"]):
+            content = f"/* {name}@{version} {dist_file} */\n".encode("utf-8")
+            info = tarfile.TarInfo(f"package/{dist_file}")
+            info.size = len(content)
+            tarball.addfile(info, io.BytesIO(content))
+    print(os.path.basename(tarball_path))
+
+
+def npm(args):
+    if args[:1] in (["install"], ["i"], ["ci"]):
+        package_json = read_json("package.json", {})
+        if args[0] == "ci":
+            # install exactly what package-lock.json lists
+            lock = read_json("package-lock.json", {"packages": {}})
+            for path in lock["packages"]:
+                if path:
+                    install_package(path[len("node_modules/") :])
+            return 0
+        dev = "-D" in args or "--save-dev" in args
+        dependency_type = "devDependencies" if dev else "dependencies"
+        for spec in [arg for arg in args[1:] if not arg.startswith("-")]:
+            name = package_name(spec)
+            package_json.setdefault(dependency_type, {})[
+                name
+            ] = f"^{STUB_PACKAGE_VERSION}"
+            install_package(name)
+        write_json("package.json", package_json)
+        packages = {"": {"name": os.path.basename(os.getcwd())}}
+        for dependency_type in ("dependencies", "devDependencies"):
+            for name in package_json.get(dependency_type, {}):
+                packages[f"node_modules/{name}"] = {
+                    "version": STUB_PACKAGE_VERSION,
+                    "dev": dependency_type == "devDependencies",
+                }
+        write_json(
+            "package-lock.json",
+            {
+                "name": os.path.basename(os.getcwd()),
+                "lockfileVersion": 3,
+                "requires": True,
+                "packages": packages,
+            },
+        )
+        return 0
+    if args[:1] == ["pack"]:
+        destination = "."
+        if "--pack-destination" in args:
+            destination = args[args.index("--pack-destination") + 1]
+        for spec in [arg for arg in args[1:] if not arg.startswith("-")]:
+            if spec != destination:
+                pack(spec, destination)
+        return 0
+    if args[:1] == ["run"] and len(args) > 1:
+        script = read_json("package.json", {}).get("scripts", {}).get(args[1])
+        if script is None:
+            print(f'npm error Missing script: "{args[1]}"', file=sys.stderr)
+            return 1
+        env = dict(os.environ)
+        env["PATH"] = (
+            os.path.abspath(os.path.join("node_modules", ".bin"))
+            + os.pathsep
+            + env["PATH"]
+        )
+        return subprocess.call(script, shell=True, env=env)
+    # 'cache add', 'config' and everything else
+    return 0
+
+
+def npx(args):
+    if args[:2] == ["tailwindcss", "init"]:
+        write("tailwind.config.js", TAILWIND_CONFIG)
+        return 0
+    bin_path = os.path.join("node_modules", ".bin", args[0]) if args else ""
+    if os.path.exists(bin_path):
+        return subprocess.call([bin_path, *args[1:]])
+    return 0
+
+
+def main():
+    tool = os.path.basename(sys.argv[0])
+    args = sys.argv[1:]
+    start = time.time()
+    time.sleep(float(os.environ.get(f"STUB_DELAY_{tool.upper()}", "0")))
+    returncode = {"pipenv": pipenv, "npm": npm, "npx": npx}[tool](args)
+    if os.environ.get("STUB_LOG"):
+        with open(os.environ["STUB_LOG"], "a", encoding="utf-8") as f:
+            f.write(
+                json.dumps(
+                    {"tool": tool, "args": args, "start": start, "end": time.time()}
+                )
+                + "\n"
+            )
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
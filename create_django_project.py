@@ -12,553 +12,3814 @@
 # pylint: disable=C0116
 # pylint: disable=W0621
 
+import argparse
+import ast
+import base64
+import ctypes
+import glob
+import gzip
+import hashlib
+import importlib.util
+import itertools
 import os
+import platform
+import re
+import secrets
+import select
+import shutil
+import struct
 import subprocess
+import sys
 import json
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows, files are copied without reflinks
+    fcntl = None
+
+try:
+    import brotli
+except ImportError:  # the CSS size report leaves the brotli size out
+    brotli = None
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser(os.path.join("~", ".cache"))),
+    "django-cookie-cutter",
+)
+
+
+def thread_bytes_written():
+    """Bytes the current thread caused to be written to storage (Linux only)"""
+    try:
+        with open("/proc/thread-self/io", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class Tracer:
+    """Records wall time, commands, exit codes and bytes written of every step
+
+    Every step of the TaskGraph and every command run_command starts is a span.
+    The spans are printed as a summary table and saved as a Chrome trace-event
+    file, which chrome://tracing or https://ui.perfetto.dev can open.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    @contextmanager
+    def span(self, name, category="step", **span_args):
+        """Records the with block, span_args can still be changed inside of it"""
+        stack = self.local.__dict__.setdefault("stack", [])
+        stack.append(span_args)
+        start = time.perf_counter()
+        bytes_before = thread_bytes_written()
+        try:
+            yield span_args
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            bytes_after = thread_bytes_written()
+            if bytes_before is not None and bytes_after is not None:
+                span_args["bytes_written"] = span_args.get("bytes_written", 0) + (
+                    bytes_after - bytes_before
+                )
+            # the bytes written by a command count for the step which ran it, too
+            if stack and "bytes_written" in span_args:
+                stack[-1]["bytes_written"] = (
+                    stack[-1].get("bytes_written", 0) + span_args["bytes_written"]
+                )
+                if category == "command":
+                    stack[-1]["commands"] = stack[-1].get("commands", 0) + 1
+            with self.lock:
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": category,
+                        "ph": "X",
+                        "ts": round((start - self.start) * 1e6),
+                        "dur": round((end - start) * 1e6),
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": span_args,
+                    }
+                )
+
+    def print_summary(self):
+        steps = sorted(
+            (event for event in self.events if event["cat"] == "step"),
+            key=lambda event: event["ts"],
+        )
+        if not steps:
+            return
+        name_width = max(len("Step"), *(len(event["name"]) for event in steps))
+        print()
+        print(
+            f"{'Step':<{name_width}}  {'Start':>7}  {'Time':>7}  {'Cmds':>4}  {'Written':>10}"
+        )
+        for event in steps:
+            written = event["args"].get("bytes_written")
+            print(
+                f"{event['name']:<{name_width}}  {event['ts'] / 1e6:>6.1f}s  "
+                f"{event['dur'] / 1e6:>6.1f}s  {event['args'].get('commands', 0):>4}  "
+                f"{'-' if written is None else f'{written / 1024:.0f} KB':>10}"
+            )
+        for event in sorted(self.events, key=lambda event: event["ts"]):
+            if event["cat"] == "command":
+                print(
+                    f"  {event['dur'] / 1e6:>6.1f}s  exit {event['args'].get('exit_code')}"
+                    f"  {event['args']['command']}"
+                )
+
+    def save_chrome_trace(self, trace_file):
+        with self.lock:
+            trace = {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+        with open(trace_file, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=1)
+        print(f"Chrome trace saved to '{trace_file}'")
+
+
+TRACER = Tracer()
+
+
+def run_command(command, cwd=None, env=None):
+    """Like subprocess.run(check=True), the command is recorded as a span of TRACER"""
+    with TRACER.span(
+        " ".join(command[:3]), "command", command=" ".join(command), cwd=cwd
+    ) as span_args:
+        process = subprocess.Popen(command, cwd=cwd, env=env)
+        if hasattr(os, "wait4"):
+            # wait4 also returns the resource usage of the command
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            span_args["bytes_written"] = rusage.ru_oublock * 512
+        else:
+            process.wait()
+        span_args["exit_code"] = process.returncode
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+
 
 class DjangoSettingsModifier:
+    """Edits settings.py in one pass
+
+    settings.py is parsed once into an index of its top-level assignments. All
+    installers queue their edits on the same instance, write_settings() applies
+    them in a single pass over the source and writes the file once.
+    """
+
     def __init__(self, settings_file):
         self.settings_file = settings_file
-        self.lines = []
+        self.source = ""
+        self.line_offsets = []
+        self.statements = []
+        self.assignments = {}
+        self.edits = []
+        self.list_appends = {}
 
     def read_settings(self):
         try:
             with open(self.settings_file, "r", encoding="utf-8") as f:
-                self.lines = f.readlines()
+                self.source = f.read()
         except FileNotFoundError:
             print(f"Error: Settings file '{self.settings_file}' not found.")
-            exit()
+            exit(1)
+
+        lines = self.source.splitlines(keepends=True)
+        self.line_offsets = [0]
+        for line in lines:
+            self.line_offsets.append(self.line_offsets[-1] + len(line))
+        self.assignments = {}
+        self.statements = ast.parse(self.source).body
+        for node in self.statements:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1:
+                target = node.targets[0]
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                target = node.target
+            else:
+                continue
+            if isinstance(target, ast.Name):
+                self.assignments[target.id] = node
+
+    def offset(self, lineno, col_offset):
+        """Position in the source of an ast position (col_offset counts UTF-8 bytes)"""
+        line_start = self.line_offsets[lineno - 1]
+        line = self.source[line_start : self.line_offsets[lineno]]
+        return line_start + len(line.encode("utf-8")[:col_offset].decode("utf-8"))
+
+    def assignment_span(self, name):
+        """Position of the assignment of name, other statements on its lines are kept"""
+        node = self.assignments[name]
+        start = self.offset(node.lineno, node.col_offset)
+        end = self.offset(node.end_lineno, node.end_col_offset)
+        return start, end
+
+    def line_end(self, name):
+        """Start of the line after the assignment of name and the statements after it
+        on the same line (e.g. A = 1; B = 2), the end of the file if there is none"""
+        end_lineno = self.assignments[name].end_lineno
+        changed = True
+        while changed:
+            changed = False
+            for statement in self.statements:
+                if statement.lineno <= end_lineno < statement.end_lineno:
+                    end_lineno = statement.end_lineno
+                    changed = True
+        return self.line_offsets[end_lineno]
+
+    def set_value(self, name, value_source):
+        """Replaces the whole assignment of name"""
+        if name not in self.assignments:
+            print(f"{name} not found in settings.py")
+            return False
+        start, end = self.assignment_span(name)
+        self.edits.append((start, end, f"{name} = {value_source}"))
+        return True
+
+    def insert_after(self, name, source):
+        """Inserts source (one or more lines) after the line of the assignment of name"""
+        if name not in self.assignments:
+            print(f"{name} not found in settings.py")
+            return False
+        end = self.line_end(name)
+        if end > 0 and self.source[end - 1] != "\n":
+            # the last line of settings.py has no line break
+            source = "\n" + source
+        self.edits.append((end, end, source))
+        return True
+
+    def append_to_list(self, name, items, comment=None):
+        """Appends items (Python source) at the end of the list assigned to name
+
+        Items which are in the list already are skipped (e.g. on --resume).
+        """
+        node = self.assignments.get(name)
+        if node is None:
+            print(f"{name} not found in settings.py")
+            return False
+        if not isinstance(node.value, (ast.List, ast.Tuple)):
+            print(f"Error: {name} in settings.py is not a list.")
+            exit(1)
+        existing = {ast.dump(element) for element in node.value.elts}
+        items = [
+            item
+            for item in items
+            if ast.dump(ast.parse(item, mode="eval").body) not in existing
+        ]
+        if not items:
+            return False
+        lines = [f"    # {comment}\n"] if comment else []
+        lines += [f"    {item},\n" for item in items]
+        self.list_appends.setdefault(name, []).extend(lines)
+        return True
+
+    def list_append_edits(self):
+        """The edits for the queued list items, all items of a list are inserted at once"""
+        edits = []
+        for name, lines in self.list_appends.items():
+            value = self.assignments[name].value
+            bracket = (
+                self.offset(value.end_lineno, value.end_col_offset) - 1
+            )  # the closing bracket
+            if value.elts:
+                last = value.elts[-1]
+                last_end = self.offset(last.end_lineno, last.end_col_offset)
+                # a comment after the last item may contain commas, too
+                if "," not in self.source[last_end:bracket].split("#")[0]:
+                    edits.append((last_end, last_end, ","))
+            line_start = self.source.rfind("\n", 0, bracket) + 1
+            if self.source[line_start:bracket].strip():
+                # the closing bracket follows an item on the same line
+                edits.append((bracket, bracket, "\n" + "".join(lines)))
+            else:
+                edits.append((line_start, line_start, "".join(lines)))
+        return edits
 
     def write_settings(self):
+        """Applies all queued edits in one pass and writes settings.py once"""
+        edits = sorted(self.edits + self.list_append_edits(), key=lambda edit: edit[0])
+        parts = []
+        position = 0
+        for start, end, text in edits:
+            if start < position:
+                print(f"Error: Overlapping changes in '{self.settings_file}'.")
+                exit(1)
+            parts.append(self.source[position:start])
+            parts.append(text)
+            position = end
+        parts.append(self.source[position:])
         with open(self.settings_file, "w", encoding="utf-8") as f:
-            f.write("".join(self.lines))
+            f.write("".join(parts))
+        print(f"settings.py updated with {len(edits)} changes")
 
     def add_to_installed_apps(self, new_app):
-        installed_apps_index = None
-        for i, line in enumerate(self.lines):
-            if line.startswith("INSTALLED_APPS"):
-                installed_apps_index = i
-                break
-
-        if installed_apps_index is not None:
-            # Find the closing bracket of INSTALLED_APPS list
-            closing_bracket_index = None
-            for j in range(installed_apps_index, len(self.lines)):
-                if "]" in self.lines[j]:
-                    closing_bracket_index = j
-                    break
-
-            if closing_bracket_index is not None:
-                # Insert the new app before the closing bracket
-                self.lines.insert(
-                    closing_bracket_index,
-                    "    # local apps\n"  # Comment line
-                    f'    "{new_app}",\n',  # New app line
-                )
-                print("App added successfully to INSTALLED_APPS!")
-            else:
-                print("Error: Closing bracket of INSTALLED_APPS not found.")
-        else:
-            print("INSTALLED_APPS not found in settings.py")
+        if self.append_to_list("INSTALLED_APPS", [f'"{new_app}"'], "local apps"):
+            print("App added successfully to INSTALLED_APPS!")
         print()
 
     def update_time_zone(self, new_time_zone):
-        time_zone_index = None
-        for i, line in enumerate(self.lines):
-            if line.startswith("TIME_ZONE"):
-                time_zone_index = i
-                break
-
-        if time_zone_index is not None:
-            self.lines[time_zone_index] = f'TIME_ZONE = "{new_time_zone}"\n'
+        if self.set_value("TIME_ZONE", f'"{new_time_zone}"'):
             print("Time zone updated successfully!")
-        else:
-            print("TIME_ZONE not found in settings.py")
 
     def update_language_code(self, new_language_code):
-        language_code_index = None
-        for i, line in enumerate(self.lines):
-            if line.startswith("LANGUAGE_CODE"):
-                language_code_index = i
-                break
-
-        if language_code_index is not None:
-            self.lines[language_code_index] = f'LANGUAGE_CODE = "{new_language_code}"\n'
+        if self.set_value("LANGUAGE_CODE", f'"{new_language_code}"'):
             print("Language code updated successfully!")
-        else:
-            print("LANGUAGE_CODE not found in settings.py")
 
     def update_static_file_dir(self):
         """Add 'STATICFILES_DIRS = [BASEDIR / "static"]' to settings.py"""
-        static_index = None
-        for i, line in enumerate(self.lines):
-            if line.startswith("STATIC_URL"):
-                static_index = i
-                break
-        if static_index is not None:
-            self.lines.insert(
-                static_index + 1,
-                'STATICFILES_DIRS = [BASE_DIR / "static"]\n',
-            )
+        if "STATICFILES_DIRS" in self.assignments:
+            print("Staticfiles already set")
+        elif self.insert_after(
+            "STATIC_URL", 'STATICFILES_DIRS = [BASE_DIR / "static"]\n'
+        ):
             print("Staticfiles inserted successfully")
         else:
             print("Staticfiles inserted NOT successfully")
             exit(1)
 
 
-class FolderCreator:
-    def __init__(self, folder_name):
-        self.folder_name = folder_name
+class PackageJson:
+    """package.json in memory, all Node installers register their changes on it
 
-    def create_folder(self):
-        """Create the Django Project Folder"""
-        if os.path.exists(self.folder_name):
-            print(f"Error: Folder '{self.folder_name}' already exists.")
-            exit(1)
+    The build script is kept as a list of steps and only joined when the file is
+    written, once, at the end. Steps are sorted by their order and command, so
+    the build script doesn't depend on the order (or thread) they were added in.
+    """
+
+    def __init__(self, folder_path):
+        self.package_json_path = os.path.join(folder_path, "package.json")
+        self.data = {}
+        self.scripts = {}
+        self.build_steps = []
+        self.vendor_files = {}
+        self.lock = threading.Lock()
+
+    def read(self):
+        if os.path.exists(self.package_json_path):
+            with open(self.package_json_path, "r", encoding="utf-8") as file:
+                self.data = json.load(file)
         else:
-            os.makedirs(self.folder_name)
+            print("package.json file not found.")
 
-    def create_static_folders(self):
-        """Creates static folders inside the main folder"""
-        static_folder = os.path.join(self.folder_name, "static")
-        os.makedirs(static_folder, exist_ok=True)
+    def set_script(self, name, command):
+        with self.lock:
+            self.scripts[name] = command
 
-        static_subfolders = ["css", "js", "fonts"]
-        for subfolder in static_subfolders:
-            subfolder_path = os.path.join(static_folder, subfolder)
-            os.makedirs(subfolder_path, exist_ok=True)
+    def add_build_step(self, command, order=0):
+        with self.lock:
+            self.build_steps.append((order, command))
 
-        self.create_main_css()
+    def add_vendor_file(self, source, destination):
+        """A file VendorAssetSync copies from node_modules to static/"""
+        with self.lock:
+            self.vendor_files[source] = destination
 
-    def create_main_css(self):
-        """Creates main.css file with content"""
-        main_css_path = os.path.join(self.folder_name, "static", "css", "main.css")
-        if not os.path.exists(main_css_path):
-            with open(main_css_path, "w", encoding="utf-8") as main_css_file:
-                main_css_file.write(
-                    "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+
+    def write(self):
+        with self.lock:
+            if self.vendor_files:
+                self.data["vendor"] = dict(sorted(self.vendor_files.items()))
+            # scripts already in the file (e.g. of an earlier run) are kept
+            scripts = dict(self.data.get("scripts", {}))
+            if self.build_steps:
+                scripts["build"] = "; ".join(
+                    command for _, command in sorted(self.build_steps)
                 )
-            print("main.css created successfully")
-        else:
-            print("Error creating static/css/main.css")
-            print("File already exists!")
+            scripts.update(self.scripts)
+            self.data["scripts"] = scripts
+            with open(self.package_json_path, "w", encoding="utf-8") as file:
+                json.dump(self.data, file, indent=2)
+        print("package.json written!")
 
-    def create_readme(self):
-        """creates the README.md file"""
-        with open(
-            os.path.join(self.folder_name, "README.md"), "w", encoding="utf-8"
-        ) as readme_file:
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            readme_file.write(
-                f"{self.folder_name} - {current_date} - copyright by Christian Hetmann\n\n"
+
+class TaskGraph:
+    """Runs the scaffolding steps as a dependency graph
+
+    Every step only waits for the steps it depends on, so independent branches
+    (e.g. the pipenv and the npm toolchain) run in parallel on a thread pool.
+    With a StepJournal, finished steps are recorded and skipped when resuming.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.tasks = {}
+        self.outputs = {}
+        self.in_memory = set()
+
+    def add_task(self, name, func, depends_on=(), outputs=(), in_memory=False):
+        """outputs are the paths (relative to the project) a finished step leaves behind,
+        in_memory steps only prepare objects of this run for later steps"""
+        for dependency in depends_on:
+            if dependency not in self.tasks:
+                raise ValueError(
+                    f"Task '{name}' depends on unknown task '{dependency}'"
+                )
+        self.tasks[name] = (func, tuple(depends_on))
+        self.outputs[name] = tuple(outputs)
+        if in_memory:
+            self.in_memory.add(name)
+
+    def completed_steps(self, journal):
+        """Steps the journal lists as finished whose outputs still exist
+
+        A step is only skipped if every step it depends on is skipped, too. An
+        in_memory step is only skipped if every step that uses it is skipped.
+        """
+        skipped = {
+            name
+            for name in self.tasks
+            if journal.is_completed(name)
+            and all(
+                os.path.exists(os.path.join(journal.folder_path, output))
+                for output in self.outputs[name]
             )
-            readme_file.write(
-                """ 
-Oben im base.html muss {% load static %} angegeben werden.
+        }
+        changed = True
+        while changed:
+            changed = False
+            for name, (_, depends_on) in self.tasks.items():
+                if name not in skipped:
+                    continue
+                dependents = [
+                    dependent
+                    for dependent, (_, dependencies) in self.tasks.items()
+                    if name in dependencies
+                ]
+                if any(dependency not in skipped for dependency in depends_on) or (
+                    name in self.in_memory
+                    and any(dependent not in skipped for dependent in dependents)
+                ):
+                    skipped.discard(name)
+                    changed = True
+        return skipped
 
-Je nachdem ob Alpine oder HTMX installiert wurde, muss es dann entsprechend in dem base.html hinzugefügt werden.
+    def run(self, journal=None):
+        start = time.perf_counter()
+        done = self.completed_steps(journal) if journal is not None else set()
+        if done:
+            print(f"Skipping the steps finished before: {', '.join(sorted(done))}")
+        pending = {name: task for name, task in self.tasks.items() if name not in done}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                while pending or running:
+                    for name, (func, depends_on) in list(pending.items()):
+                        if all(dependency in done for dependency in depends_on):
+                            running[pool.submit(self.run_task, name, func)] = name
+                            del pending[name]
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        # re-raises errors of the step, including SystemExit from exit(1)
+                        future.result()
+                        done.add(name)
+                        if journal is not None:
+                            journal.complete(name)
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                # steps which finished while the pool wound down are not run again
+                if journal is not None:
+                    for future, name in running.items():
+                        if not future.cancelled() and future.exception() is None:
+                            journal.complete(name)
+                raise
+        print(f"All steps finished in {time.perf_counter() - start:.1f}s")
 
-Für Alpine.js: oben im <head> ... <script defer src="{% static 'js/alpine/cdn.min.js' %}"></script> ... <head>
+    @staticmethod
+    def run_task(name, func):
+        with TRACER.span(name):
+            func()
 
-Für Tailwind CSS: <head> ... <link rel="stylesheet" href="{% static 'css/main.min.css' %}">
 
-Bei HTMX: Innerhalb des body tags, ganz unten: <script src="{% static 'js/htmx/htmx.min.js' %}"></script>
+class StepJournal:
+    """Records the finished steps of a scaffold in the project folder, for --resume
 
-NPM-WATCH ist ja installiert. Daher in einem seperatem Terminal Fenster nun: "npm run watch" eingeben.
+    The journal also keeps the options of the run, so a resumed run creates the
+    same project. It is removed when the project is complete.
+    """
 
-GGf. muss im Dokument noch Prettier als DEFAULT Formatter ausgewählt werden, damit das prettier-plugin-tailwindcss zu sortieren der Css classes funktioniert.
+    file_name = ".scaffold-journal.json"
+    # the options which change the scaffolded project
+    options = [
+        "project",
+        "app",
+        "browser_reload",
+        "alpine",
+        "htmx",
+        "env_backend",
+        "django_admin",
+        "shared_store",
+        "lock_templates",
+        "production_static",
+        "performance_profile",
+        "cache_backend",
+        "minify_css",
+        "vendor_cache",
+        "tailwind_backend",
+        "base_env",
+    ]
 
-                """
-            )
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.path = os.path.join(folder_path, self.file_name)
+        self.data = {"options": {}, "steps": {}}
+        self.lock = threading.Lock()
 
-    def create_pylint_config(self):
-        "Creates the .pylintrc and sets the max line length"
-        pylintrc_file = os.path.join(self.folder_name, ".pylintrc")
-        if not os.path.exists(pylintrc_file):
-            with open(pylintrc_file, "w", encoding="utf-8") as p_file:
-                p_file.write("[FORMAT]\nmax-line-length=140\n")
-                print(".pylintrc with max-line-length=140 created created")
-        else:
-            print("Error creating '.pylintrc' file")
+    def exists(self):
+        return os.path.exists(self.path)
 
-    def create_virtualenv_and_django_project(
-        self, django_project_name, django_app_name
-    ):
-        """creates a virtual environment and Django project with the given names"""
-        os.chdir(self.folder_name)
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.data = json.load(f)
+
+    def start(self, args):
+        self.data = {
+            "options": {name: getattr(args, name) for name in self.options},
+            "steps": {},
+        }
+
+    def is_completed(self, name):
+        return name in self.data["steps"]
+
+    def complete(self, name):
+        with self.lock:
+            self.data["steps"][name] = datetime.now().isoformat(timespec="seconds")
+            # written under a temporary name, an interrupted write keeps the old journal
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(temp_path, self.path)
+
+    def remove(self):
+        if self.exists():
+            os.remove(self.path)
+
+
+class PackageCache:
+    """Local wheel directory and npm tarball cache, so installs work without network access"""
+
+    def __init__(self, cache_dir, offline=False):
+        self.wheel_dir = os.path.join(cache_dir, "wheels")
+        self.npm_cache_dir = os.path.join(cache_dir, "npm")
+        self.offline = offline
+
+    def pip_env(self):
+        """Environment for pipenv and pip, pip only looks into the wheel directory when offline"""
+        env = dict(os.environ)
+        if self.offline:
+            env["PIP_NO_INDEX"] = "1"
+            env["PIP_FIND_LINKS"] = self.wheel_dir
+            env.pop("PIP_INDEX_URL", None)
+            env.pop("PIP_EXTRA_INDEX_URL", None)
+        return env
+
+    def uv_env(self):
+        """Environment for uv, uv finds the wheels in the wheel directory when offline"""
+        env = dict(os.environ)
+        if self.offline:
+            env["UV_OFFLINE"] = "1"
+            env["UV_FIND_LINKS"] = self.wheel_dir
+        return env
+
+    def npm_env(self):
+        """Environment for npm and npx, npm only uses the tarball cache when offline"""
+        env = dict(os.environ)
+        if self.offline:
+            env["npm_config_cache"] = self.npm_cache_dir
+            env["npm_config_offline"] = "true"
+            env["npm_config_audit"] = "false"
+            env["npm_config_fund"] = "false"
+        return env
+
+    def check_filled(self):
+        for cache_dir in (self.wheel_dir, self.npm_cache_dir):
+            if not os.path.isdir(cache_dir) or not os.listdir(cache_dir):
+                print(f"Error: Cache folder '{cache_dir}' is empty.")
+                print("Run 'fill-cache' on a machine with internet access first.")
+                exit(1)
+
+    def fill(self, dependency_planner, lock_templates=None):
+        """Downloads all planned packages including their dependencies
+
+        With lock_templates, also the exact versions the templates pin, which
+        --offline installs by default.
+        """
+        os.makedirs(self.wheel_dir, exist_ok=True)
+        os.makedirs(self.npm_cache_dir, exist_ok=True)
+        env = dict(os.environ, npm_config_cache=self.npm_cache_dir)
         try:
-            subprocess.run(["pipenv", "install", "django"], check=True)
-            print()
-            subprocess.run(["pipenv", "install", "pytest"], check=True)
-            print()
-            subprocess.run(
+            run_command(
                 [
-                    "pipenv",
-                    "run",
-                    "django-admin",
-                    "startproject",
-                    django_project_name,
-                    ".",
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "download",
+                    "--dest",
+                    self.wheel_dir,
+                    *dependency_planner.python_packages,
                 ],
-                check=True,
-            )
-            print()
-            subprocess.run(
-                ["pipenv", "run", "python", "manage.py", "startapp", django_app_name],
-                check=True,
             )
+            if lock_templates is not None:
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    for requirements_file in lock_templates.pinned_requirements(
+                        temp_dir
+                    ):
+                        # the locks are complete, their dependencies are in them
+                        run_command(
+                            [
+                                sys.executable,
+                                "-m",
+                                "pip",
+                                "download",
+                                "--no-deps",
+                                "--dest",
+                                self.wheel_dir,
+                                "-r",
+                                requirements_file,
+                            ],
+                        )
+            print(f"Wheels downloaded to '{self.wheel_dir}'")
+            # a throwaway install fetches every tarball of the dependency trees into the cache
+            with tempfile.TemporaryDirectory() as npm_project:
+                run_command(
+                    ["npm", "install", "-D", *dependency_planner.npm_dev_packages],
+                    cwd=npm_project,
+                    env=env,
+                )
+                if dependency_planner.npm_packages:
+                    run_command(
+                        ["npm", "install", *dependency_planner.npm_packages],
+                        cwd=npm_project,
+                        env=env,
+                    )
+            # 'npm ci' of every npm template caches exactly the tarballs it pins
+            for template_path in (
+                lock_templates.matching("npm") if lock_templates is not None else []
+            ):
+                with tempfile.TemporaryDirectory() as npm_project:
+                    for name in ("package.json", "package-lock.json"):
+                        shutil.copyfile(
+                            os.path.join(template_path, name),
+                            os.path.join(npm_project, name),
+                        )
+                    run_command(
+                        ["npm", "ci", "--ignore-scripts"], cwd=npm_project, env=env
+                    )
+            print(f"npm packages cached in '{self.npm_cache_dir}'")
         except subprocess.CalledProcessError as e:
             print(f"Error: {e}")
             exit(1)
 
-    def create_django_app_template_folders(self, django_app_name):
-        """Creates template folders inside the django_app folder"""
-        templates_folder = os.path.join(
-            self.folder_name, django_app_name, "templates", django_app_name
-        )
-        os.makedirs(templates_folder, exist_ok=True)
-        print(f"Templates folder in '{django_app_name}' created.")
 
-    def create_postcss_config(self):
-        """Creates postcss.config.js file"""
-        postcss_config_path = os.path.join(self.folder_name, "postcss.config.js")
-        if not os.path.exists(postcss_config_path):
-            with open(
-                postcss_config_path, "w", encoding="utf-8"
-            ) as postcss_config_file:
-                postcss_config_file.write(
-                    """module.exports = {
-    plugins: {
-        tailwindcss: {},
-        autoprefixer: {},
-    }
-}"""
-                )
-            print("postcss.config.js created successfully!")
-        else:
-            print("postcss.config.js already exists.")
+class EnvironmentBackend:
+    """Creates the virtual environment of a project, adds packages and runs commands in it
 
+    create() resolves the packages into a lock file and installs them, sync()
+    installs exactly what the lock file lists (e.g. for a cloned project). The
+    seconds of every phase are printed and appended to the timings file, the
+    'env-report' command compares them per backend.
+    """
 
-class DjangoBrowserReloadInstaller:
-    def __init__(self, folder_path, settings_file, django_project_name) -> None:
-        self.settings_file = settings_file
-        self.django_project_url_file = os.path.join(
-            folder_path, django_project_name, "urls.py"
-        )
-        self.lines = []
+    name = None
+    lock_file = None
+    # files of a lock template and the folder of lock_templates they are saved in
+    template_files = ()
+    template_kind = None
+
+    def __init__(self, folder_path, package_cache, timings_file=None):
         self.folder_path = folder_path
-        self.install_django_browser_reload()
-        self.read_settings()
-        self.add_to_installed_apps()
-        self.add_to_middleware()
-        self.write_settings()
-        self.update_urls_py()
+        self.package_cache = package_cache
+        self.timings_file = timings_file
+        self.timings = {}
+        # the environment is .venv of the project, created with this Python
+        # (pipenv keeps it in a folder of its own otherwise)
+        self.venv_in_project = False
 
-    def read_settings(self):
-        try:
-            with open(self.settings_file, "r", encoding="utf-8") as f:
-                self.lines = f.readlines()
-        except FileNotFoundError:
-            print(f"Error: Settings file '{self.settings_file}' not found.")
-            exit(1)
+    @classmethod
+    def available(cls):
+        return shutil.which(cls.name) is not None
 
-    def write_settings(self):
-        with open(self.settings_file, "w", encoding="utf-8") as f:
-            f.write("".join(self.lines))
+    @contextmanager
+    def timed(self, phase):
+        start = time.perf_counter()
+        yield
+        self.timings[phase] = self.timings.get(phase, 0) + time.perf_counter() - start
 
-    def install_django_browser_reload(self):
-        """Install django-browser-reload -> https://pypi.org/project/django-browser-reload/"""
-        os.chdir(self.folder_path)
-        try:
-            subprocess.run(["pipenv", "install", "django-browser-reload"], check=True)
-            print()
-        except subprocess.CalledProcessError as e:
-            print(f"Error: {e}")
-            exit(1)
+    def env(self):
+        return self.package_cache.pip_env()
 
-    def add_to_installed_apps(self):
-        installed_apps_index = None
-        for i, line in enumerate(self.lines):
-            if line.startswith("INSTALLED_APPS"):
-                installed_apps_index = i
-                break
-
-        if installed_apps_index is not None:
-            # Find the closing bracket of INSTALLED_APPS list
-            closing_bracket_index = None
-            for j in range(installed_apps_index, len(self.lines)):
-                if "]" in self.lines[j]:
-                    closing_bracket_index = j
-                    break
+    def venv_path(self):
+        return os.path.join(self.folder_path, ".venv")
 
-            if closing_bracket_index is not None:
-                # Insert django-browser-reload app before the closing bracket
-                self.lines.insert(
-                    closing_bracket_index,
-                    "    # 3rd party apps\n"  # Comment line
-                    '    "django_browser_reload",\n',  # django-browser-reload
-                )
-                print("django-browser-reload added successfully to INSTALLED_APPS!")
-            else:
-                print("Error: Closing bracket of INSTALLED_APPS not found.")
-        else:
-            print("INSTALLED_APPS not found in settings.py")
-        print()
+    def create(self, packages):
+        raise NotImplementedError
 
-    def add_to_middleware(self):
-        middleware_index = None
-        for i, line in enumerate(self.lines):
-            if line.startswith("MIDDLEWARE"):
-                middleware_index = i
-                break
-
-        if middleware_index is not None:
-            # Find the closing bracket of MIDDLEWARE list
-            closing_bracket_index = None
-            for j in range(middleware_index, len(self.lines)):
-                if "]" in self.lines[j]:
-                    closing_bracket_index = j
-                    break
+    def sync(self):
+        raise NotImplementedError
 
-            if closing_bracket_index is not None:
-                # Insert django-browser-reload app before the closing bracket
-                self.lines.insert(
-                    closing_bracket_index,
-                    "    # needed for django-browser-reload\n"  # Comment line
-                    '    "django_browser_reload.middleware.BrowserReloadMiddleware",\n',  # django-browser-reload
-                )
-                print("django-browser-reload added successfully to MIDDLEWARE!")
-            else:
-                print("Error: Closing bracket of MIDDLEWARE not found.")
-        else:
-            print("MIDDLEWARE not found in settings.py")
-        print()
+    def lock(self, packages):
+        """Only resolves the packages into the lock file, for the lock templates"""
+        raise NotImplementedError
 
-    def update_urls_py(self):
-        """changes the django project url file and adds django-browser-reload and also add include to the import statement"""
-        if os.path.exists(self.django_project_url_file):
-            with open(self.django_project_url_file, "r", encoding="utf-8") as url_file:
-                content = url_file.readlines()
+    def command(self, command):
+        """The command line which runs command inside of the environment"""
+        return command
 
-            django_urls_index = None
-            for i, line in enumerate(content):
-                if line.startswith("from django.urls"):
-                    django_urls_index = i
-                    break
+    def run(self, command):
+        run_command(self.command(command), cwd=self.folder_path, env=self.env())
 
-            if django_urls_index is not None:
-                content[django_urls_index] = "from django.urls import path, include\n"
-                print("'include' successfully added to import statement!")
-            else:
-                print("'include' could not be imported!")
-                exit(1)
+    def locked_versions(self):
+        """{normalized package name: version} of the lock file"""
+        raise NotImplementedError
 
-            new_lines = "\n# added for django-browser-reload\n"
-            new_lines += """urlpatterns.append(path("__reload__/", include("django_browser_reload.urls")))\n"""
+    @staticmethod
+    def normalize_name(name):
+        return re.sub(r"[-_.]+", "-", name).lower()
 
-            content += new_lines
+    def report(self, action, packages=()):
+        print(
+            f"{self.name} {action}: "
+            + ", ".join(
+                f"{phase} {seconds:.1f}s" for phase, seconds in self.timings.items()
+            )
+        )
+        if self.timings_file is None:
+            return
+        os.makedirs(os.path.dirname(self.timings_file), exist_ok=True)
+        with open(self.timings_file, "a", encoding="utf-8") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "backend": self.name,
+                        "action": action,
+                        "packages": sorted(packages),
+                        "offline": self.package_cache.offline,
+                        "timings": self.timings,
+                        "date": datetime.now().isoformat(timespec="seconds"),
+                    }
+                )
+                + "\n"
+            )
 
-            with open(self.django_project_url_file, "w", encoding="utf-8") as f:
-                f.write("".join(content))
-            print("django project urls.py UPDATED for django-browser-reload")
-        else:
-            print("Error adding django-browser-reload to urls.py")
 
+class PipenvBackend(EnvironmentBackend):
+    """pipenv with Pipfile and Pipfile.lock, pipenv resolves and installs in one call"""
 
-class AlpineJSInstaller:
-    def __init__(self, folder_path) -> None:
-        self.folder_path = folder_path
-        self.install_alpine()
+    name = "pipenv"
+    lock_file = "Pipfile.lock"
+    template_files = ("Pipfile", "Pipfile.lock")
+    template_kind = "pipenv"
 
-    def install_alpine(self):
-        """Install Alpine JS"""
-        os.chdir(self.folder_path)
-        print()
-        print("Installing AlpineJS")
-        try:
-            subprocess.run(
-                [
-                    "npm",
-                    "install",
-                    "alpinejs",
-                ],
-                check=True,
-            )
-            print("AlpineJS installed successfully!")
+    def env(self):
+        env = super().env()
+        if self.venv_in_project:
+            env["PIPENV_VENV_IN_PROJECT"] = "1"
+            env["PIPENV_PYTHON"] = sys.executable
+        return env
 
-            alpine_folder = os.path.join(self.folder_path, "static", "js", "alpine")
-            os.makedirs(alpine_folder, exist_ok=True)
+    def create(self, packages):
+        # one install call means one resolve and one lock for the whole Pipfile
+        with self.timed("resolve+install"):
+            run_command(
+                ["pipenv", "install", *packages], cwd=self.folder_path, env=self.env()
+            )
 
-            package_json_path = os.path.join(self.folder_path, "package.json")
-            if os.path.exists(package_json_path):
-                with open(package_json_path, "r", encoding="utf-8") as file:
-                    data = json.load(file)
+    def sync(self):
+        with self.timed("install"):
+            run_command(["pipenv", "sync"], cwd=self.folder_path, env=self.env())
 
-            # Add the "scripts" key
-            data["scripts"]["build"] = (
-                data["scripts"]["build"]
-                + "; cp node_modules/alpinejs/dist/cdn.min.js static/js/alpine/cdn.min.js"
+    def lock(self, packages):
+        with open(
+            os.path.join(self.folder_path, "Pipfile"), "w", encoding="utf-8"
+        ) as f:
+            f.write(
+                '[[source]]\nurl = "https://pypi.org/simple"\nverify_ssl = true\n'
+                'name = "pypi"\n\n[packages]\n'
+                + "".join(f'{package} = "*"\n' for package in packages)
+                + "\n[dev-packages]\n\n[requires]\n"
+                f'python_version = "{sys.version_info.major}.{sys.version_info.minor}"\n'
             )
-            with open(package_json_path, "w", encoding="utf-8") as file:
-                json.dump(data, file, indent=2)
-            print("package.json updated accordingly!")
+        # the virtual environment pipenv needs for locking is removed with the folder
+        env = dict(self.env(), PIPENV_VENV_IN_PROJECT="1")
+        with self.timed("resolve"):
+            run_command(["pipenv", "lock"], cwd=self.folder_path, env=env)
 
-        except subprocess.CalledProcessError as e:
-            print(f"Error: {e}")
-            exit(1)
+    def command(self, command):
+        return ["pipenv", "run", *command]
 
+    def locked_versions(self):
+        try:
+            with open(
+                os.path.join(self.folder_path, self.lock_file), "r", encoding="utf-8"
+            ) as f:
+                packages = json.load(f)["default"]
+        except (FileNotFoundError, KeyError, ValueError):
+            return {}
+        return {
+            self.normalize_name(name): package["version"].lstrip("=")
+            for name, package in packages.items()
+            if "version" in package
+        }
 
-class HTMXInstaller:
-    def __init__(self, folder_path) -> None:
-        self.folder_path = folder_path
-        self.install_htmx()
 
-    def install_htmx(self):
-        """Install HTMX"""
-        os.chdir(self.folder_path)
-        print()
-        print("Installing HTMX")
-        try:
-            subprocess.run(
-                [
-                    "npm",
-                    "install",
-                    "htmx.org",
-                ],
-                check=True,
-            )
-            print("HTMX installed successfully!")
+class VenvPipBackend(EnvironmentBackend):
+    """python -m venv and pip, without a separate tool
 
-            htmx_folder = os.path.join(self.folder_path, "static", "js", "htmx")
-            os.makedirs(htmx_folder, exist_ok=True)
+    The planned packages are written to requirements.in. pip resolves them with
+    'install --dry-run --report' into requirements.lock (pinned, with hashes),
+    which is then installed without resolving again.
+    """
 
-            package_json_path = os.path.join(self.folder_path, "package.json")
-            if os.path.exists(package_json_path):
-                with open(package_json_path, "r", encoding="utf-8") as file:
-                    data = json.load(file)
+    name = "venv"
+    lock_file = "requirements.lock"
+    requirements_file = "requirements.in"
+    template_files = ("requirements.in", "requirements.lock")
+    template_kind = "requirements"
 
-            # Add the "scripts" key
-            data["scripts"]["build"] = (
-                data["scripts"]["build"]
-                + "; cp node_modules/htmx.org/dist/htmx.min.js static/js/htmx/htmx.min.js"
-            )
-            with open(package_json_path, "w", encoding="utf-8") as file:
-                json.dump(data, file, indent=2)
-            print("package.json updated accordingly!")
+    @classmethod
+    def available(cls):
+        return importlib.util.find_spec("venv") is not None
 
-        except subprocess.CalledProcessError as e:
-            print(f"Error: {e}")
-            exit(1)
+    def bin_path(self, name):
+        if os.name == "nt":
+            return os.path.join(self.folder_path, ".venv", "Scripts", f"{name}.exe")
+        return os.path.join(self.folder_path, ".venv", "bin", name)
+
+    def command(self, command):
+        return [self.bin_path(command[0]), *command[1:]]
+
+    def create_venv(self):
+        with self.timed("venv"):
+            run_command(
+                [sys.executable, "-m", "venv", ".venv"],
+                cwd=self.folder_path,
+                env=self.env(),
+            )
+
+    def write_requirements(self, packages):
+        with open(
+            os.path.join(self.folder_path, self.requirements_file),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            f.write("".join(f"{package}\n" for package in packages))
+
+    def resolve(self):
+        report_file = os.path.join(self.folder_path, ".resolve-report.json")
+        # the environment is created with this Python, its pip resolves the same way
+        run_command(
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "--quiet",
+                "--dry-run",
+                "--ignore-installed",
+                "--report",
+                report_file,
+                "-r",
+                self.requirements_file,
+            ],
+            cwd=self.folder_path,
+            env=self.env(),
+        )
+        with open(report_file, "r", encoding="utf-8") as f:
+            resolved = json.load(f)["install"]
+        os.remove(report_file)
+        requirements = []
+        hashes = []
+        for package in sorted(resolved, key=lambda p: p["metadata"]["name"].lower()):
+            metadata = package["metadata"]
+            requirements.append(f"{metadata['name']}=={metadata['version']}")
+            archive_hashes = (
+                package["download_info"].get("archive_info", {}).get("hashes", {})
+            )
+            hashes.append(archive_hashes.get("sha256"))
+        lines = [f"# resolved by pip from {self.requirements_file}\n"]
+        for requirement, sha256 in zip(requirements, hashes):
+            # pip only checks hashes if every requirement has one
+            if all(hashes):
+                lines.append(f"{requirement} \\\n    --hash=sha256:{sha256}\n")
+            else:
+                lines.append(f"{requirement}\n")
+        with open(
+            os.path.join(self.folder_path, self.lock_file), "w", encoding="utf-8"
+        ) as f:
+            f.write("".join(lines))
+
+    def install(self):
+        run_command(
+            [
+                self.bin_path("python"),
+                "-m",
+                "pip",
+                "install",
+                "--quiet",
+                "--no-deps",
+                "-r",
+                self.lock_file,
+            ],
+            cwd=self.folder_path,
+            env=self.env(),
+        )
+
+    def create(self, packages):
+        self.create_venv()
+        self.write_requirements(packages)
+        with self.timed("resolve"):
+            self.resolve()
+        with self.timed("install"):
+            self.install()
+
+    def sync(self):
+        self.create_venv()
+        with self.timed("install"):
+            self.install()
+
+    def lock(self, packages):
+        self.write_requirements(packages)
+        with self.timed("resolve"):
+            self.resolve()
+
+    def locked_versions(self):
+        try:
+            with open(
+                os.path.join(self.folder_path, self.lock_file), "r", encoding="utf-8"
+            ) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return {}
+        versions = {}
+        for line in lines:
+            match = re.match(r"([A-Za-z0-9][\w.-]*)==([^\s;\\]+)", line)
+            if match:
+                versions[self.normalize_name(match.group(1))] = match.group(2)
+        return versions
+
+
+class UvBackend(VenvPipBackend):
+    """uv (https://docs.astral.sh/uv/), a much faster resolver and installer
+
+    Same files as the venv backend: uv compiles requirements.in into
+    requirements.lock with hashes and syncs .venv to it.
+    """
+
+    name = "uv"
+
+    @classmethod
+    def available(cls):
+        return shutil.which("uv") is not None
+
+    def env(self):
+        return self.package_cache.uv_env()
+
+    def uv_options(self):
+        # --offline alone would still ask the index, the wheels only come from find-links
+        return ["--no-index"] if self.package_cache.offline else []
+
+    def create_venv(self):
+        with self.timed("venv"):
+            run_command(
+                ["uv", "venv", "--quiet", "--python", sys.executable, ".venv"],
+                cwd=self.folder_path,
+                env=self.env(),
+            )
+
+    def resolve(self):
+        run_command(
+            [
+                "uv",
+                "pip",
+                "compile",
+                "--quiet",
+                "--generate-hashes",
+                *self.uv_options(),
+                self.requirements_file,
+                "-o",
+                self.lock_file,
+            ],
+            cwd=self.folder_path,
+            env=self.env(),
+        )
+
+    def install(self):
+        run_command(
+            [
+                "uv",
+                "pip",
+                "sync",
+                "--quiet",
+                "--python",
+                self.bin_path("python"),
+                *self.uv_options(),
+                self.lock_file,
+            ],
+            cwd=self.folder_path,
+            env=self.env(),
+        )
+
+
+ENV_BACKENDS = {
+    backend.name: backend for backend in (PipenvBackend, VenvPipBackend, UvBackend)
+}
+
+
+LOCK_TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "lock_templates"
+)
+
+
+class LockTemplates:
+    """Pinned lock files for every option combination, installed without resolving
+
+    lock_templates/<kind>/<key>/ holds the files of one set of packages: Pipfile
+    and Pipfile.lock (pipenv), requirements.in and requirements.lock (venv and uv)
+    or package.json and package-lock.json (npm), and template.json with the
+    packages and the Python version (and platform) they were resolved for.
+    'refresh-locks' regenerates them.
+    """
+
+    def __init__(self, template_dir=LOCK_TEMPLATE_DIR):
+        self.template_dir = template_dir
+
+    @staticmethod
+    def python_key(python_packages):
+        packages_json = json.dumps(sorted(python_packages))
+        return hashlib.sha256(packages_json.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def python_meta(kind):
+        """A Python lock is only used with the Python version it was resolved for"""
+        meta = {"python": f"{sys.version_info.major}.{sys.version_info.minor}"}
+        if kind != "pipenv":
+            # pip resolves for this platform only, Pipfile.lock has markers for all
+            meta["platform"] = sys.platform
+        return meta
+
+    def path(self, kind, key):
+        return os.path.join(self.template_dir, kind, key)
+
+    def copy(self, kind, key, folder_path, meta=None):
+        """Copies the files of a template into folder_path, returns False if there is none"""
+        template_path = self.path(kind, key)
+        try:
+            template = NodeModulesStore.read_json(
+                os.path.join(template_path, "template.json")
+            )
+        except FileNotFoundError:
+            return False
+        if any(template.get(name) != value for name, value in (meta or {}).items()):
+            return False
+        for name in template["files"]:
+            shutil.copyfile(
+                os.path.join(template_path, name), os.path.join(folder_path, name)
+            )
+        print(f"{', '.join(template['files'])} copied from the lock template '{key}'")
+        return True
+
+    def copy_python(self, environment, python_packages):
+        kind = environment.template_kind
+        return self.copy(
+            kind,
+            self.python_key(python_packages),
+            environment.folder_path,
+            self.python_meta(kind),
+        )
+
+    def copy_npm(self, npm_dev_packages, npm_packages, folder_path):
+        key = NodeModulesStore.packages_key(npm_dev_packages, npm_packages)
+        if not self.copy("npm", key, folder_path):
+            return False
+        # the templates are named 'project', npm names a project after its folder
+        for name in ("package.json", "package-lock.json"):
+            file_path = os.path.join(folder_path, name)
+            content = NodeModulesStore.read_json(file_path)
+            for package in (content, content.get("packages", {}).get("", {})):
+                if "name" in package:
+                    package["name"] = os.path.basename(folder_path)
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=2)
+        return True
+
+    def matching(self, kind, meta=None):
+        """Folders of all templates of a kind, only the ones for meta (e.g. this Python)"""
+        kind_dir = os.path.join(self.template_dir, kind)
+        if not os.path.isdir(kind_dir):
+            return []
+        template_paths = []
+        for key in sorted(os.listdir(kind_dir)):
+            try:
+                template = NodeModulesStore.read_json(
+                    os.path.join(self.path(kind, key), "template.json")
+                )
+            except FileNotFoundError:
+                continue
+            if all(template.get(name) == value for name, value in (meta or {}).items()):
+                template_paths.append(self.path(kind, key))
+        return template_paths
+
+    def pinned_requirements(self, temp_dir):
+        """Requirements files with the pinned packages of all Python templates for this Python
+
+        requirements.lock is one already, the packages of Pipfile.lock are written
+        into temp_dir.
+        """
+        requirements_files = [
+            os.path.join(template_path, "requirements.lock")
+            for template_path in self.matching(
+                "requirements", self.python_meta("requirements")
+            )
+        ]
+        for template_path in self.matching("pipenv", self.python_meta("pipenv")):
+            lock = NodeModulesStore.read_json(
+                os.path.join(template_path, "Pipfile.lock")
+            )
+            lines = []
+            for name, package in sorted(lock.get("default", {}).items()):
+                if "version" not in package:
+                    continue
+                markers = f" ; {package['markers']}" if package.get("markers") else ""
+                hashes = "".join(
+                    f" --hash={package_hash}"
+                    for package_hash in package.get("hashes", [])
+                )
+                lines.append(f"{name}{package['version']}{markers}{hashes}\n")
+            requirements_file = os.path.join(
+                temp_dir, f"{os.path.basename(template_path)}-Pipfile.txt"
+            )
+            with open(requirements_file, "w", encoding="utf-8") as f:
+                f.write("".join(lines))
+            requirements_files.append(requirements_file)
+        return requirements_files
+
+    def save(self, kind, key, folder_path, files, template):
+        template_path = self.path(kind, key)
+        os.makedirs(template_path, exist_ok=True)
+        for name in files:
+            shutil.copyfile(
+                os.path.join(folder_path, name), os.path.join(template_path, name)
+            )
+        with open(
+            os.path.join(template_path, "template.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(dict(template, files=list(files)), f, indent=2)
+            f.write("\n")
+        print(f"Lock template '{kind}/{key}' saved")
+
+    def refresh(self, environment_backend, package_cache):
+        """Resolves the packages of every option combination again and saves the locks"""
+        # browser_reload, alpine, htmx, production_static, minify_css, vendor_cache
+        # and tailwind_standalone, in the order of plan_dependencies
+        combinations = list(itertools.product([False, True], repeat=7))
+        try:
+            python_sets = {
+                tuple(plan_dependencies(*options).python_packages)
+                for options in combinations
+            }
+            for python_packages in sorted(python_sets):
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    environment = environment_backend(temp_dir, package_cache)
+                    environment.lock(python_packages)
+                    kind = environment.template_kind
+                    self.save(
+                        kind,
+                        self.python_key(python_packages),
+                        temp_dir,
+                        environment.template_files,
+                        dict(self.python_meta(kind), packages=list(python_packages)),
+                    )
+            npm_sets = {
+                (
+                    tuple(plan_dependencies(*options).npm_dev_packages),
+                    tuple(plan_dependencies(*options).npm_packages),
+                )
+                for options in combinations
+            }
+            for npm_dev_packages, npm_packages in sorted(npm_sets):
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    project_path = os.path.join(temp_dir, "project")
+                    os.makedirs(project_path)
+                    TailwindInstaller(project_path).npm_install(
+                        npm_dev_packages,
+                        npm_packages,
+                        package_cache.npm_env(),
+                        lock_only=True,
+                    )
+                    self.save(
+                        "npm",
+                        NodeModulesStore.packages_key(npm_dev_packages, npm_packages),
+                        project_path,
+                        ["package.json", "package-lock.json"],
+                        {
+                            "dev_packages": list(npm_dev_packages),
+                            "packages": list(npm_packages),
+                        },
+                    )
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {e}")
+            exit(1)
+
+
+# ioctl request of Linux to share the data blocks of two files (reflink, copy-on-write)
+FICLONE = 0x40049409
+
+
+def file_hash(path, algorithm="sha256"):
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def clone_file(src, dst):
+    """Copies a file as a reflink where the filesystem supports it (btrfs, xfs, ...)"""
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def clone_tree(src, dst, hardlink_dirs=("node_modules",), skip_dirs=()):
+    """Copies a folder tree, files below hardlink_dirs are hardlinked instead of copied
+
+    Only trees which are never edited in place (like node_modules) are hardlinked,
+    everything else gets its own copy, so editing it never changes the source.
+    Top-level folders in skip_dirs are not copied.
+    """
+    for root, dirs, files in os.walk(src):
+        relative_root = os.path.relpath(root, src)
+        if relative_root == ".":
+            dirs[:] = [name for name in dirs if name not in skip_dirs]
+        target_root = os.path.normpath(os.path.join(dst, relative_root))
+        os.makedirs(target_root, exist_ok=True)
+        hardlink = relative_root.split(os.sep)[0] in hardlink_dirs
+        for name in dirs + files:
+            source = os.path.join(root, name)
+            target = os.path.join(target_root, name)
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target)
+            elif name in files:
+                try:
+                    if not hardlink:
+                        raise OSError("copy")
+                    os.link(source, target)
+                except OSError:
+                    clone_file(source, target)
+        # symlinked folders were recreated as links above and are not walked
+        dirs[:] = [
+            name for name in dirs if not os.path.islink(os.path.join(root, name))
+        ]
+
+
+class BaseEnvironmentCache:
+    """Virtual environments of locked package sets, cloned into new projects
+
+    A base environment is saved once per Python and set of locked package
+    versions. A clone hardlinks the files of site-packages (pip replaces them,
+    but never edits them in place) and copies everything else, with the path of
+    the environment rewritten (console scripts, activate, pyvenv.cfg).
+    """
+
+    def __init__(self, cache_dir):
+        self.base_dir = os.path.join(cache_dir, "base-envs")
+
+    @staticmethod
+    def available():
+        # the launchers in Scripts/ on Windows contain the path in binary form
+        return os.name != "nt"
+
+    @staticmethod
+    def key(environment):
+        versions = environment.locked_versions()
+        if not versions:
+            return None
+        key_json = json.dumps(
+            {
+                "python": sys.version,
+                "executable": os.path.realpath(sys.executable),
+                "platform": f"{sys.platform}-{platform.machine()}",
+                "packages": versions,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()[:16]
+
+    def path(self, key):
+        return os.path.join(self.base_dir, key)
+
+    def has(self, key):
+        return key is not None and os.path.exists(
+            os.path.join(self.path(key), "base.json")
+        )
+
+    @staticmethod
+    def clone_venv(src, dst, old_path, new_path):
+        old_bytes = old_path.encode()
+        new_bytes = new_path.encode()
+        for root, dirs, files in os.walk(src):
+            relative_root = os.path.relpath(root, src)
+            target_root = os.path.normpath(os.path.join(dst, relative_root))
+            os.makedirs(target_root, exist_ok=True)
+            in_site_packages = "site-packages" in relative_root.split(os.sep)
+            for name in dirs + files:
+                source = os.path.join(root, name)
+                target = os.path.join(target_root, name)
+                if os.path.islink(source):
+                    # bin/python links to the Python of the system
+                    os.symlink(os.readlink(source), target)
+                elif name not in files:
+                    continue
+                elif in_site_packages:
+                    # the old path in the .pyc files is replaced by the import system on load
+                    try:
+                        os.link(source, target)
+                    except OSError:
+                        clone_file(source, target)
+                else:
+                    with open(source, "rb") as f:
+                        content = f.read()
+                    if old_bytes == new_bytes or old_bytes not in content:
+                        clone_file(source, target)
+                        continue
+                    with open(target, "wb") as f:
+                        f.write(content.replace(old_bytes, new_bytes))
+                    shutil.copymode(source, target)
+            dirs[:] = [
+                name for name in dirs if not os.path.islink(os.path.join(root, name))
+            ]
+
+    def clone(self, key, environment):
+        """Clones the base environment into .venv of the project, False if there is none"""
+        if not self.has(key):
+            return False
+        with open(
+            os.path.join(self.path(key), "base.json"), "r", encoding="utf-8"
+        ) as f:
+            base = json.load(f)
+        venv_path = environment.venv_path()
+        if os.path.exists(venv_path):
+            # e.g. the one 'pipenv lock' needed
+            shutil.rmtree(venv_path)
+        self.clone_venv(
+            os.path.join(self.path(key), "venv"), venv_path, base["path"], venv_path
+        )
+        print(f"Virtual environment cloned from the base environment '{key}'")
+        return True
+
+    def save(self, key, environment):
+        if key is None or self.has(key):
+            return
+        venv_path = environment.venv_path()
+        if not os.path.isdir(venv_path):
+            print(
+                f"No virtual environment in '{venv_path}', no base environment saved."
+            )
+            return
+        os.makedirs(self.base_dir, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(dir=self.base_dir)
+        self.clone_venv(venv_path, os.path.join(temp_dir, "venv"), venv_path, venv_path)
+        with open(os.path.join(temp_dir, "base.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    # rewritten to the path of every clone
+                    "path": venv_path,
+                    "python": sys.version,
+                    "packages": environment.locked_versions(),
+                },
+                f,
+                indent=2,
+            )
+        try:
+            os.replace(temp_dir, self.path(key))
+            print(f"Base environment '{key}' saved for the next projects")
+        except OSError:
+            # another run saved the same base environment in the meantime
+            shutil.rmtree(temp_dir)
+
+
+class ProjectSnapshotCache:
+    """Fully scaffolded projects per option set, which are cloned instead of scaffolded again
+
+    A snapshot keeps the folder, project and app names it was created with. After
+    cloning, these identifiers are renamed to the new names.
+    """
+
+    # files which contain the project or app name (after the folders are renamed)
+    renamed_files = [
+        "manage.py",
+        os.path.join("{project}", "settings.py"),
+        os.path.join("{project}", "urls.py"),
+        os.path.join("{project}", "wsgi.py"),
+        os.path.join("{project}", "asgi.py"),
+        os.path.join("{project}", "production.py"),
+        os.path.join("{app}", "apps.py"),
+        "tailwind.config.js",
+        "package.json",
+    ]
+    # files with the folder name as the npm package name
+    package_files = ["package.json", "package-lock.json"]
+
+    def __init__(self, cache_dir):
+        self.snapshot_dir = os.path.join(cache_dir, "snapshots")
+
+    @staticmethod
+    def option_key(options):
+        """Hash of everything that changes the scaffolded project except its names"""
+        options_json = json.dumps(options, sort_keys=True)
+        return hashlib.sha256(options_json.encode("utf-8")).hexdigest()[:16]
+
+    def path(self, key):
+        return os.path.join(self.snapshot_dir, key)
+
+    def has(self, key):
+        return os.path.exists(os.path.join(self.path(key), "snapshot.json"))
+
+    def save(self, key, folder_path, project_name, app_name):
+        if self.has(key):
+            return
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(dir=self.snapshot_dir)
+        # a virtual environment contains absolute paths, every clone creates its own
+        clone_tree(
+            folder_path,
+            os.path.join(temp_dir, "project"),
+            hardlink_dirs=("node_modules", "bin"),
+            skip_dirs=(".venv",),
+        )
+        with open(os.path.join(temp_dir, "snapshot.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "folder": os.path.basename(folder_path),
+                    "project": project_name,
+                    "app": app_name,
+                },
+                f,
+                indent=2,
+            )
+        try:
+            os.replace(temp_dir, self.path(key))
+            print(f"Snapshot '{key}' saved for the next projects with these options")
+        except OSError:
+            # another run saved the same snapshot in the meantime
+            shutil.rmtree(temp_dir)
+
+    def read_snapshot(self, key):
+        with open(
+            os.path.join(self.path(key), "snapshot.json"), "r", encoding="utf-8"
+        ) as f:
+            return json.load(f)
+
+    def name_clash(self, key, project_name, app_name):
+        """Why the snapshot can't be renamed to these names, None if it can"""
+        if project_name == app_name:
+            return f"the project and the app are both named '{app_name}'"
+        old = self.read_snapshot(key)
+        for name in (project_name, app_name):
+            if name not in (old["project"], old["app"]) and os.path.lexists(
+                os.path.join(self.path(key), "project", name)
+            ):
+                return f"the snapshot already has a '{name}'"
+        return None
+
+    def restore(self, key, folder_path, project_name, app_name):
+        """Clones the snapshot into folder_path and renames its identifiers"""
+        old = self.read_snapshot(key)
+        try:
+            clone_tree(
+                os.path.join(self.path(key), "project"),
+                folder_path,
+                hardlink_dirs=("node_modules", "bin"),
+            )
+
+            app_templates = os.path.join(folder_path, old["app"], "templates")
+            if os.path.isdir(os.path.join(app_templates, old["app"])):
+                os.rename(
+                    os.path.join(app_templates, old["app"]),
+                    os.path.join(app_templates, app_name),
+                )
+            # through temporary names, the new project name may be the old app name
+            renames = [(old["project"], project_name), (old["app"], app_name)]
+            for old_name, _ in renames:
+                os.rename(
+                    os.path.join(folder_path, old_name),
+                    os.path.join(folder_path, f".{old_name}.renaming"),
+                )
+            for old_name, new_name in renames:
+                os.rename(
+                    os.path.join(folder_path, f".{old_name}.renaming"),
+                    os.path.join(folder_path, new_name),
+                )
+
+            replacements = {old["project"]: project_name, old["app"]: app_name}
+            for renamed_file in self.renamed_files:
+                file_path = os.path.join(
+                    folder_path, renamed_file.format(project=project_name, app=app_name)
+                )
+                if os.path.exists(file_path):
+                    self.rename_identifiers(
+                        file_path, replacements, old["app"], app_name
+                    )
+            for package_file in self.package_files:
+                file_path = os.path.join(folder_path, package_file)
+                if os.path.exists(file_path):
+                    self.rename_package(
+                        file_path, old["folder"], os.path.basename(folder_path)
+                    )
+            self.new_secret_key(os.path.join(folder_path, project_name, "settings.py"))
+        except OSError:
+            # no half-cloned folder, which would block the next try
+            shutil.rmtree(folder_path, ignore_errors=True)
+            raise
+        print(f"Project cloned from snapshot '{key}'")
+
+    @staticmethod
+    def rename_identifiers(file_path, replacements, old_app, new_app):
+        """Renames all identifiers in one pass, so a new name is never renamed again"""
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        # the AppConfig class, e.g. 'pages.apps.PagesConfig'
+        names = {f"{old_app.capitalize()}Config": f"{new_app.capitalize()}Config"}
+        names.update(replacements)
+        # module paths like 'django.core' or doc URLs like '/topics/' are no identifiers
+        not_before = r"\w./" if file_path.endswith(".py") else r"\w."
+        identifiers = "|".join(
+            re.escape(name) for name in sorted(replacements, key=len, reverse=True)
+        )
+        content = re.sub(
+            rf"\b{re.escape(old_app.capitalize())}Config\b"
+            rf"|(?<![{not_before}])(?:{identifiers})(?![\w-])",
+            lambda match: names[match.group(0)],
+            content,
+        )
+        # write a new file, so a hardlinked source would never be changed
+        os.remove(file_path)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    @staticmethod
+    def rename_package(file_path, old_folder, new_folder):
+        """Renames the folder only in the "name" fields, other strings may match it, too"""
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        data = json.loads(content)
+        # package-lock.json repeats the name of the root package under "packages"
+        for entry in (data, data.get("packages", {}).get("", {})):
+            if entry.get("name") == old_folder:
+                entry["name"] = new_folder
+        os.remove(file_path)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            if content.endswith("\n"):
+                f.write("\n")
+
+    @staticmethod
+    def new_secret_key(settings_file):
+        """Every project needs its own SECRET_KEY, not the one of the snapshot"""
+        chars = "abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)"
+        secret_key = "django-insecure-" + "".join(
+            secrets.choice(chars) for _ in range(50)
+        )
+        settings_modifier = DjangoSettingsModifier(settings_file)
+        settings_modifier.read_settings()
+        settings_modifier.set_value("SECRET_KEY", f'"{secret_key}"')
+        settings_modifier.write_settings()
+
+
+class NodeModulesStore:
+    """Content-addressed store, node_modules trees are hardlinked from it instead of installed
+
+    Every file is stored once as objects/<sha256>[-x] (-x for executables). For every
+    set of npm packages, a manifest records the files and symlinks of node_modules
+    and the package.json dependencies and package-lock.json npm created for it.
+    """
+
+    def __init__(self, cache_dir):
+        self.store_dir = os.path.join(cache_dir, "store")
+        self.objects_dir = os.path.join(self.store_dir, "objects")
+        self.manifests_dir = os.path.join(self.store_dir, "manifests")
+
+    @staticmethod
+    def packages_key(npm_dev_packages, npm_packages):
+        packages_json = json.dumps(
+            {"dev": sorted(npm_dev_packages), "runtime": sorted(npm_packages)}
+        )
+        return hashlib.sha256(packages_json.encode("utf-8")).hexdigest()[:16]
+
+    def manifest_path(self, key):
+        return os.path.join(self.manifests_dir, f"{key}.json")
+
+    def object_path(self, object_name):
+        return os.path.join(self.objects_dir, object_name[:2], object_name[2:])
+
+    def add(self, key, folder_path):
+        """Moves the files of node_modules into the store and hardlinks them back"""
+        node_modules = os.path.join(folder_path, "node_modules")
+        files = {}
+        symlinks = {}
+        try:
+            for root, dirs, names in os.walk(node_modules):
+                for name in dirs + names:
+                    path = os.path.join(root, name)
+                    relative_path = os.path.relpath(path, node_modules)
+                    if os.path.islink(path):
+                        symlinks[relative_path] = os.readlink(path)
+                    elif name in names:
+                        files[relative_path] = self.add_file(path)
+        except OSError as e:
+            # e.g. the store is on another filesystem, so nothing can be hardlinked
+            print(f"node_modules not added to the store: {e}")
+            return
+
+        package_json = self.read_json(os.path.join(folder_path, "package.json"))
+        manifest = {
+            "files": files,
+            "symlinks": symlinks,
+            "package.json": {
+                key: value
+                for key, value in package_json.items()
+                if key in ("dependencies", "devDependencies")
+            },
+            "package-lock.json": self.read_json(
+                os.path.join(folder_path, "package-lock.json")
+            ),
+        }
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        temp_path = f"{self.manifest_path(key)}.{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, self.manifest_path(key))
+        print(f"node_modules added to the store ({len(files)} files)")
+
+    def add_file(self, path):
+        object_name = file_hash(path)
+        if os.stat(path).st_mode & 0o111:
+            object_name += "-x"
+        object_path = self.object_path(object_name)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            try:
+                os.link(path, object_path)
+            except FileExistsError:
+                pass
+        if not os.path.samefile(path, object_path):
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            os.link(object_path, temp_path)
+            os.replace(temp_path, path)
+        return object_name
+
+    def link(self, key, folder_path):
+        """Creates node_modules from the store, returns False if it has no such tree"""
+        if not os.path.exists(self.manifest_path(key)):
+            return False
+        manifest = self.read_json(self.manifest_path(key))
+        for object_name in set(manifest["files"].values()):
+            if not os.path.exists(self.object_path(object_name)):
+                print("The store misses files of this tree, npm installs it again.")
+                return False
+
+        node_modules = os.path.join(folder_path, "node_modules")
+        for relative_path, object_name in manifest["files"].items():
+            path = os.path.join(node_modules, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                os.link(self.object_path(object_name), path)
+            except OSError:
+                shutil.copy2(self.object_path(object_name), path)
+        for relative_path, target in manifest["symlinks"].items():
+            path = os.path.join(node_modules, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.symlink(target, path)
+
+        # the same files npm would have written for this tree
+        package_json_path = os.path.join(folder_path, "package.json")
+        package_json = (
+            self.read_json(package_json_path)
+            if os.path.exists(package_json_path)
+            else {}
+        )
+        package_json.update(manifest["package.json"])
+        with open(package_json_path, "w", encoding="utf-8") as f:
+            json.dump(package_json, f, indent=2)
+        package_lock = manifest["package-lock.json"]
+        for package in (package_lock, package_lock.get("packages", {}).get("", {})):
+            if "name" in package:
+                package["name"] = os.path.basename(folder_path)
+        with open(
+            os.path.join(folder_path, "package-lock.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(package_lock, f, indent=2)
+        print(f"node_modules linked from the store ({len(manifest['files'])} files)")
+        return True
+
+    def gc(self):
+        """Removes files no project links to anymore and the trees which needed them"""
+        removed_files = 0
+        freed_bytes = 0
+        if os.path.isdir(self.objects_dir):
+            for root, _, names in os.walk(self.objects_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    # only the store itself links to this file
+                    if stat.st_nlink == 1:
+                        os.remove(path)
+                        removed_files += 1
+                        freed_bytes += stat.st_size
+
+        removed_manifests = 0
+        if os.path.isdir(self.manifests_dir):
+            for name in os.listdir(self.manifests_dir):
+                manifest_path = os.path.join(self.manifests_dir, name)
+                manifest = self.read_json(manifest_path)
+                if not all(
+                    os.path.exists(self.object_path(object_name))
+                    for object_name in manifest["files"].values()
+                ):
+                    os.remove(manifest_path)
+                    removed_manifests += 1
+        print(
+            f"Removed {removed_files} unused files ({freed_bytes / 1024 / 1024:.1f} MB) "
+            f"and {removed_manifests} incomplete trees from the store"
+        )
+
+    @staticmethod
+    def read_json(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+class VendorCache:
+    """Content-addressed cache of the vendored JS files, copied into static/js without npm
+
+    Every library is pinned to a version and the SRI hash of its dist file,
+    which is stored once as objects/<sha384>. Only a file missing in the cache
+    is fetched, with 'npm pack' (which checks the integrity of the tarball).
+    Downloads and cached files are both checked against the pinned hash.
+    """
+
+    libraries = {
+        "alpinejs": {
+            "version": "3.14.7",
+            "file": "dist/cdn.min.js",
+            "integrity": "sha384-cixRWCxxaN2ZlgSKys0xeW++971nkjz01WMhvEVsYDm6hlVuq/vm14WM+CLfIkBB",
+            "static": "js/alpine/cdn.min.js",
+            "defer": True,
+        },
+        "htmx.org": {
+            "version": "2.0.3",
+            "file": "dist/htmx.min.js",
+            "integrity": "sha384-0895/pl2MU10Hqc6jd4RvrthNlDiE9U1tWmX7WRESftEDRosgxNsQG/Ze9YMRzHq",
+            "static": "js/htmx/htmx.min.js",
+            "defer": False,
+        },
+    }
+    lock_name = "vendor.lock.json"
+
+    def __init__(self, cache_dir, package_cache):
+        self.vendor_dir = os.path.join(cache_dir, "vendor")
+        self.objects_dir = os.path.join(self.vendor_dir, "objects")
+        self.package_cache = package_cache
+        self.copied = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def integrity(path):
+        """Subresource Integrity hash of a file, e.g. 'sha384-...'"""
+        digest = bytes.fromhex(file_hash(path, "sha384"))
+        return "sha384-" + base64.b64encode(digest).decode("ascii")
+
+    def pin_key(self, name):
+        library = self.libraries[name]
+        return f"{name}@{library['version']}/{library['file']}"
+
+    def object_path(self, integrity):
+        digest = base64.b64decode(integrity.split("-", 1)[1]).hex()
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def get(self, name):
+        """Path and SRI hash of the dist file of a library, it is fetched if it is missing"""
+        integrity = self.libraries[name]["integrity"]
+        object_path = self.object_path(integrity)
+        with self.lock:
+            if os.path.exists(object_path) and self.integrity(object_path) != integrity:
+                print(
+                    f"{self.pin_key(name)} in the vendor cache is damaged, removing it"
+                )
+                os.remove(object_path)
+            if not os.path.exists(object_path):
+                self.fetch(name)
+            return object_path, integrity
+
+    def fetch(self, name):
+        library = self.libraries[name]
+        print(f"Fetching {self.pin_key(name)} into the vendor cache")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                run_command(
+                    [
+                        "npm",
+                        "pack",
+                        f"{name}@{library['version']}",
+                        "--pack-destination",
+                        temp_dir,
+                    ],
+                    cwd=temp_dir,
+                    env=self.package_cache.npm_env(),
+                )
+                tarballs = glob.glob(os.path.join(temp_dir, "*.tgz"))
+                dist_file = os.path.join(temp_dir, "dist_file")
+                with tarfile.open(tarballs[0], "r:gz") as tarball, open(
+                    dist_file, "wb"
+                ) as f:
+                    # npm tarballs have all files below package/
+                    shutil.copyfileobj(
+                        tarball.extractfile(f"package/{library['file']}"), f
+                    )
+            except (subprocess.CalledProcessError, IndexError, KeyError) as e:
+                print(f"Error: {self.pin_key(name)} could not be fetched: {e}")
+                exit(1)
+            integrity = self.integrity(dist_file)
+            if integrity != library["integrity"]:
+                print(
+                    f"Error: {self.pin_key(name)} is {integrity}, "
+                    f"but it is pinned to {library['integrity']}."
+                )
+                exit(1)
+            object_path = self.object_path(integrity)
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.replace(dist_file, object_path)
+
+    def fill(self):
+        for name in self.libraries:
+            self.get(name)
+        print(f"Vendored JS libraries cached in '{self.vendor_dir}'")
+
+    def copy(self, name, folder_path):
+        """Copies the dist file of a library into static/ of the project"""
+        object_path, integrity = self.get(name)
+        library = self.libraries[name]
+        destination = os.path.join(folder_path, "static", *library["static"].split("/"))
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        clone_file(object_path, destination)
+        with self.lock:
+            self.copied[library["static"]] = {
+                "package": name,
+                "version": library["version"],
+                "file": library["file"],
+                "integrity": integrity,
+            }
+        print(f"{self.pin_key(name)} copied to static/{library['static']}")
+
+    def write_lock(self, folder_path):
+        """Records the SRI hashes of the copied files and prints their script tags"""
+        if not self.copied:
+            print("No vendored JS libraries, vendor.lock.json is not needed.")
+            return
+        with open(
+            os.path.join(folder_path, self.lock_name), "w", encoding="utf-8"
+        ) as f:
+            json.dump(dict(sorted(self.copied.items())), f, indent=2)
+        print(f"{self.lock_name} written, the script tags for base.html:")
+        for static_path, entry in sorted(self.copied.items()):
+            defer = " defer" if self.libraries[entry["package"]]["defer"] else ""
+            print(
+                f"  <script{defer} src=\"{{% static '{static_path}' %}}\" "
+                f"integrity=\"{entry['integrity']}\"></script>"
+            )
+
+
+class CSSBuildCache:
+    """Built main.min.css files, keyed on a digest of everything the Tailwind build reads
+
+    The digest covers tailwind.config.js, postcss.config.js, main.css, the build
+    script, package-lock.json (the npm tool versions) and every file matched by the
+    Tailwind content globs. Projects with the same inputs share one built CSS file.
+    """
+
+    config_files = ["tailwind.config.js", "postcss.config.js"]
+    input_css = os.path.join("static", "css", "main.css")
+    output_css = os.path.join("static", "css", "main.min.css")
+    # digest of the inputs main.min.css was built from, next to it in the project
+    digest_file = os.path.join("static", "css", ".main.min.css.digest")
+
+    def __init__(self, cache_dir):
+        self.build_dir = os.path.join(cache_dir, "css-builds")
+
+    @staticmethod
+    def content_globs(folder_path):
+        """The content globs of tailwind.config.js, without the excludes ('!...')"""
+        config_path = os.path.join(folder_path, "tailwind.config.js")
+        if not os.path.exists(config_path):
+            return []
+        with open(config_path, "r", encoding="utf-8") as file:
+            match = re.search(r"content:\s*\[(.*?)\]", file.read(), re.DOTALL)
+        if match is None:
+            return []
+        return [
+            pattern
+            for pattern in re.findall(r"['\"]([^'\"]+)['\"]", match.group(1))
+            if not pattern.startswith("!")
+        ]
+
+    @staticmethod
+    def build_script(folder_path):
+        package_json_path = os.path.join(folder_path, "package.json")
+        if not os.path.exists(package_json_path):
+            return ""
+        scripts = NodeModulesStore.read_json(package_json_path).get("scripts", {})
+        return scripts.get("build:css", scripts.get("build", ""))
+
+    def input_digest(self, folder_path, build_script=None):
+        """build_script is the CSS build, by default the one of package.json"""
+        digest = hashlib.sha256()
+        if build_script is None:
+            build_script = self.build_script(folder_path)
+        digest.update(build_script.encode())
+        # the installed versions, without the project name package-lock.json starts with
+        # (the version of the standalone Tailwind CSS is part of its build script)
+        lock_path = os.path.join(folder_path, "package-lock.json")
+        if not TailwindStandalone.runs(build_script) and os.path.exists(lock_path):
+            packages = NodeModulesStore.read_json(lock_path).get("packages", {})
+            packages.pop("", None)
+            digest.update(json.dumps(packages, sort_keys=True).encode())
+        inputs = [*self.config_files, self.input_css]
+        for pattern in self.content_globs(folder_path):
+            inputs += sorted(
+                os.path.relpath(path, folder_path)
+                for path in glob.glob(
+                    os.path.join(folder_path, pattern), recursive=True
+                )
+                if os.path.isfile(path)
+            )
+        for relative_path in inputs:
+            path = os.path.join(folder_path, relative_path)
+            file_digest = file_hash(path) if os.path.exists(path) else "-"
+            digest.update(f"\0{relative_path}\0{file_digest}".encode())
+        return digest.hexdigest()
+
+    def is_current(self, folder_path, digest):
+        """main.min.css of the project was built from exactly these inputs"""
+        digest_path = os.path.join(folder_path, self.digest_file)
+        if not os.path.exists(os.path.join(folder_path, self.output_css)):
+            return False
+        if not os.path.exists(digest_path):
+            return False
+        with open(digest_path, "r", encoding="utf-8") as file:
+            return file.read().strip() == digest
+
+    def restore(self, folder_path, digest):
+        cached_css = os.path.join(self.build_dir, f"{digest}.css")
+        if not os.path.exists(cached_css):
+            return False
+        clone_file(cached_css, os.path.join(folder_path, self.output_css))
+        self.mark_current(folder_path, digest)
+        return True
+
+    def save(self, folder_path, digest):
+        output_css = os.path.join(folder_path, self.output_css)
+        if not os.path.exists(output_css):
+            return
+        os.makedirs(self.build_dir, exist_ok=True)
+        # written under a temporary name, parallel projects may save the same digest
+        temp_path = os.path.join(self.build_dir, f".{digest}.{os.getpid()}.tmp")
+        clone_file(output_css, temp_path)
+        os.replace(temp_path, os.path.join(self.build_dir, f"{digest}.css"))
+        self.mark_current(folder_path, digest)
+
+    def mark_current(self, folder_path, digest):
+        with open(
+            os.path.join(folder_path, self.digest_file), "w", encoding="utf-8"
+        ) as file:
+            file.write(digest + "\n")
+
+
+class DependencyPlanner:
+    """Collects every package the chosen options need, so the environment backend and npm resolve and lock only once"""
+
+    def __init__(self):
+        self.python_packages = []
+        self.npm_dev_packages = []
+        self.npm_packages = []
+
+    def add_python_packages(self, *packages):
+        self._add(self.python_packages, packages)
+
+    def add_npm_packages(self, *packages, dev=False):
+        self._add(self.npm_dev_packages if dev else self.npm_packages, packages)
+
+    @staticmethod
+    def _add(planned, packages):
+        for package in packages:
+            if package not in planned:
+                planned.append(package)
+
+
+class FolderCreator:
+    def __init__(self, folder_name):
+        self.folder_name = folder_name
+
+    def create_folder(self):
+        """Create the Django Project Folder"""
+        if os.path.exists(self.folder_name):
+            print(f"Error: Folder '{self.folder_name}' already exists.")
+            exit(1)
+        else:
+            os.makedirs(self.folder_name)
+
+    def create_static_folders(self):
+        """Creates static folders inside the main folder"""
+        static_folder = os.path.join(self.folder_name, "static")
+        os.makedirs(static_folder, exist_ok=True)
+
+        static_subfolders = ["css", "js", "fonts"]
+        for subfolder in static_subfolders:
+            subfolder_path = os.path.join(static_folder, subfolder)
+            os.makedirs(subfolder_path, exist_ok=True)
+
+        self.create_main_css()
+
+    def create_main_css(self):
+        """Creates main.css file with content"""
+        main_css_path = os.path.join(self.folder_name, "static", "css", "main.css")
+        if not os.path.exists(main_css_path):
+            with open(main_css_path, "w", encoding="utf-8") as main_css_file:
+                main_css_file.write(
+                    "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+                )
+            print("main.css created successfully")
+        else:
+            print("Error creating static/css/main.css")
+            print("File already exists!")
+
+    def create_readme(self):
+        """creates the README.md file"""
+        with open(
+            os.path.join(self.folder_name, "README.md"), "w", encoding="utf-8"
+        ) as readme_file:
+            current_date = datetime.now().strftime("%Y-%m-%d")
+            readme_file.write(
+                f"{self.folder_name} - {current_date} - copyright by Christian Hetmann\n\n"
+            )
+            readme_file.write(""" 
+Oben im base.html muss {% load static %} angegeben werden.
+
+Je nachdem ob Alpine oder HTMX installiert wurde, muss es dann entsprechend in dem base.html hinzugefügt werden.
+
+Für Alpine.js: oben im <head> ... <script defer src="{% static 'js/alpine/cdn.min.js' %}"></script> ... <head>
+
+Für Tailwind CSS: <head> ... <link rel="stylesheet" href="{% static 'css/main.min.css' %}">
+
+Bei HTMX: Innerhalb des body tags, ganz unten: <script src="{% static 'js/htmx/htmx.min.js' %}"></script>
+
+NPM-WATCH ist ja installiert. Daher in einem seperatem Terminal Fenster nun: "npm run watch" eingeben.
+
+GGf. muss im Dokument noch Prettier als DEFAULT Formatter ausgewählt werden, damit das prettier-plugin-tailwindcss zu sortieren der Css classes funktioniert.
+
+                """)
+
+    def create_pylint_config(self):
+        "Creates the .pylintrc and sets the max line length"
+        pylintrc_file = os.path.join(self.folder_name, ".pylintrc")
+        if not os.path.exists(pylintrc_file):
+            with open(pylintrc_file, "w", encoding="utf-8") as p_file:
+                p_file.write("[FORMAT]\nmax-line-length=140\n")
+                print(".pylintrc with max-line-length=140 created created")
+        else:
+            print("Error creating '.pylintrc' file")
+
+    def create_virtualenv(
+        self, python_packages, environment, lock_templates=None, base_envs=None
+    ):
+        """creates a virtual environment with all planned packages"""
+        try:
+            # with a lock template nothing has to be resolved
+            templated = lock_templates is not None and lock_templates.copy_python(
+                environment, python_packages
+            )
+            if base_envs is not None:
+                if not templated:
+                    # only resolved, the locked versions select the base environment
+                    environment.lock(python_packages)
+                self.clone_or_sync_virtualenv(environment, base_envs, python_packages)
+            elif templated:
+                environment.sync()
+                environment.report("sync", python_packages)
+            else:
+                environment.create(python_packages)
+                environment.report("create", python_packages)
+            print(f"Installed {', '.join(python_packages)}")
+            print()
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {e}")
+            exit(1)
+
+    def create_django_project(
+        self, django_project_name, django_app_name, environment, native_skeleton=True
+    ):
+        """creates the Django project and app with the given names"""
+        try:
+            if native_skeleton and DjangoSkeletonGenerator(
+                self.folder_name, environment
+            ).generate(django_project_name, django_app_name):
+                return
+            environment.run(["django-admin", "startproject", django_project_name, "."])
+            print()
+            environment.run(["python", "manage.py", "startapp", django_app_name])
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {e}")
+            exit(1)
+
+    def sync_virtualenv(self, environment, base_envs=None):
+        """creates the virtual environment of a cloned project exactly from its lock file"""
+        try:
+            if base_envs is not None:
+                self.clone_or_sync_virtualenv(environment, base_envs)
+            else:
+                environment.sync()
+                environment.report("sync")
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {e}")
+            exit(1)
+
+    @staticmethod
+    def clone_or_sync_virtualenv(environment, base_envs, python_packages=()):
+        """clones the base environment of the lock file, or syncs and saves it"""
+        key = base_envs.key(environment)
+        with environment.timed("clone"):
+            cloned = base_envs.clone(key, environment)
+        if cloned:
+            environment.report("clone", python_packages)
+            return
+        environment.timings.pop("clone")
+        environment.sync()
+        environment.report("sync", python_packages)
+        base_envs.save(key, environment)
+
+    def create_django_app_template_folders(self, django_app_name):
+        """Creates template folders inside the django_app folder"""
+        templates_folder = os.path.join(
+            self.folder_name, django_app_name, "templates", django_app_name
+        )
+        os.makedirs(templates_folder, exist_ok=True)
+        print(f"Templates folder in '{django_app_name}' created.")
+
+    def create_postcss_config(self, minify=False):
+        """Creates postcss.config.js file, with minify the CSS is minified by cssnano"""
+        postcss_config_path = os.path.join(self.folder_name, "postcss.config.js")
+        if not os.path.exists(postcss_config_path):
+            with open(
+                postcss_config_path, "w", encoding="utf-8"
+            ) as postcss_config_file:
+                if minify:
+                    postcss_config_file.write("""module.exports = (ctx) => ({
+    plugins: {
+        tailwindcss: {},
+        autoprefixer: {},
+        // minified, unless built with 'postcss --env development'
+        cssnano: ctx.env === 'development' ? false : {},
+    }
+})""")
+                else:
+                    postcss_config_file.write("""module.exports = {
+    plugins: {
+        tailwindcss: {},
+        autoprefixer: {},
+    }
+}""")
+            print("postcss.config.js created successfully!")
+        else:
+            print("postcss.config.js already exists.")
+
+
+# The templates of 'django-admin startproject' and 'manage.py startapp' (Django 4.2 - 5.2)
+DJANGO_PROJECT_TEMPLATE = {
+    "manage.py": '''\
+#!/usr/bin/env python
+"""Django's command-line utility for administrative tasks."""
+import os
+import sys
+
+
+def main():
+    """Run administrative tasks."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{{ project_name }}.settings')
+    try:
+        from django.core.management import execute_from_command_line
+    except ImportError as exc:
+        raise ImportError(
+            "Couldn't import Django. Are you sure it's installed and "
+            "available on your PYTHONPATH environment variable? Did you "
+            "forget to activate a virtual environment?"
+        ) from exc
+    execute_from_command_line(sys.argv)
+
+
+if __name__ == '__main__':
+    main()
+''',
+    "{{ project_name }}/__init__.py": "",
+    "{{ project_name }}/asgi.py": '''\
+"""
+ASGI config for {{ project_name }} project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/{{ docs_version }}/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{{ project_name }}.settings')
+
+application = get_asgi_application()
+''',
+    "{{ project_name }}/settings.py": '''\
+"""
+Django settings for {{ project_name }} project.
+
+Generated by 'django-admin startproject' using Django {{ django_version }}.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/{{ docs_version }}/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/{{ docs_version }}/ref/settings/
+"""
+
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/{{ docs_version }}/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = '{{ secret_key }}'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = '{{ project_name }}.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = '{{ project_name }}.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/{{ docs_version }}/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/{{ docs_version }}/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/{{ docs_version }}/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/{{ docs_version }}/howto/static-files/
+
+STATIC_URL = 'static/'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/{{ docs_version }}/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+''',
+    "{{ project_name }}/urls.py": '''\
+"""
+URL configuration for {{ project_name }} project.
+
+The `urlpatterns` list routes URLs to views. For more information please see:
+    https://docs.djangoproject.com/en/{{ docs_version }}/topics/http/urls/
+Examples:
+Function views
+    1. Add an import:  from my_app import views
+    2. Add a URL to urlpatterns:  path('', views.home, name='home')
+Class-based views
+    1. Add an import:  from other_app.views import Home
+    2. Add a URL to urlpatterns:  path('', Home.as_view(), name='home')
+Including another URLconf
+    1. Import the include() function: from django.urls import include, path
+    2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
+"""
+from django.contrib import admin
+from django.urls import path
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+]
+''',
+    "{{ project_name }}/wsgi.py": '''\
+"""
+WSGI config for {{ project_name }} project.
+
+It exposes the WSGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/{{ docs_version }}/howto/deployment/wsgi/
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{{ project_name }}.settings')
+
+application = get_wsgi_application()
+''',
+}
+
+DJANGO_APP_TEMPLATE = {
+    "{{ app_name }}/__init__.py": "",
+    "{{ app_name }}/admin.py": """\
+from django.contrib import admin
+
+# Register your models here.
+""",
+    "{{ app_name }}/apps.py": """\
+from django.apps import AppConfig
+
+
+class {{ camel_case_app_name }}Config(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = '{{ app_name }}'
+""",
+    "{{ app_name }}/migrations/__init__.py": "",
+    "{{ app_name }}/models.py": """\
+from django.db import models
+
+# Create your models here.
+""",
+    "{{ app_name }}/tests.py": """\
+from django.test import TestCase
+
+# Create your tests here.
+""",
+    "{{ app_name }}/views.py": """\
+from django.shortcuts import render
+
+# Create your views here.
+""",
+}
+
+
+class DjangoSkeletonGenerator:
+    """Writes the Django project and app skeleton directly from the bundled templates
+
+    This is what 'django-admin startproject' and 'manage.py startapp' do, without
+    starting the environment and Python twice. The installed Django version is
+    read from the lock file of the environment. Like django-admin, the files are
+    formatted with black if it is on PATH. For other versions or unusual names
+    generate() returns False and the subprocess route is used instead.
+    """
+
+    supported_versions = ("4.2", "5.0", "5.1", "5.2")
+
+    def __init__(self, folder_path, environment):
+        self.folder_path = folder_path
+        self.environment = environment
+
+    def installed_django_version(self):
+        return self.environment.locked_versions().get("django")
+
+    def valid_name(self, name):
+        # django-admin refuses names of existing modules, it reports the exact error,
+        # also for the packages of the environment this Python doesn't have
+        return (
+            name.isidentifier()
+            and importlib.util.find_spec(name) is None
+            and self.environment.normalize_name(name)
+            not in self.environment.locked_versions()
+        )
+
+    def generate(self, django_project_name, django_app_name):
+        """Returns True if the skeleton was written"""
+        django_version = self.installed_django_version()
+        if django_version is None:
+            return False
+        docs_version = ".".join(django_version.split(".")[:2])
+        if docs_version not in self.supported_versions:
+            return False
+        if not (
+            self.valid_name(django_project_name) and self.valid_name(django_app_name)
+        ):
+            return False
+        if any(
+            os.path.exists(os.path.join(self.folder_path, name))
+            for name in ("manage.py", django_project_name, django_app_name)
+        ):
+            return False
+
+        chars = "abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)"
+        context = {
+            "project_name": django_project_name,
+            "app_name": django_app_name,
+            "camel_case_app_name": "".join(
+                x for x in django_app_name.title() if x != "_"
+            ),
+            "django_version": django_version,
+            "docs_version": docs_version,
+            "secret_key": "django-insecure-"
+            + "".join(secrets.choice(chars) for _ in range(50)),
+        }
+        templates = dict(DJANGO_PROJECT_TEMPLATE, **DJANGO_APP_TEMPLATE)
+        if docs_version == "5.2":
+            settings_template = "{{ project_name }}/settings.py"
+            templates[settings_template] = templates[settings_template].replace(
+                "                'django.template.context_processors.debug',\n", ""
+            )
+        written_files = []
+        for template_path, template in templates.items():
+            for key, value in context.items():
+                template_path = template_path.replace(f"{{{{ {key} }}}}", value)
+                template = template.replace(f"{{{{ {key} }}}}", value)
+            file_path = os.path.join(self.folder_path, template_path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(template)
+            written_files.append(file_path)
+        os.chmod(os.path.join(self.folder_path, "manage.py"), 0o755)
+        self.run_formatters(written_files)
+        print(
+            f"Django {django_version} project and app written from the bundled templates"
+        )
+        return True
+
+    @staticmethod
+    def run_formatters(written_files):
+        """What django.core.management.utils.run_formatters does after startproject"""
+        black_path = shutil.which("black")
+        if black_path is None:
+            return
+        try:
+            subprocess.run(
+                [black_path, "--fast", "--", *written_files], capture_output=True
+            )
+        except OSError as e:
+            print(f"Formatters failed to launch: {e}")
+
+
+class DjangoBrowserReloadInstaller:
+    # installed together with django by FolderCreator -> https://pypi.org/project/django-browser-reload/
+    python_packages = ["django-browser-reload"]
+
+    def __init__(self, folder_path, settings_modifier, django_project_name) -> None:
+        self.settings_modifier = settings_modifier
+        self.django_project_url_file = os.path.join(
+            folder_path, django_project_name, "urls.py"
+        )
+        self.folder_path = folder_path
+        self.add_to_installed_apps()
+        self.add_to_middleware()
+        self.update_urls_py()
+
+    def add_to_installed_apps(self):
+        if self.settings_modifier.append_to_list(
+            "INSTALLED_APPS", ['"django_browser_reload"'], "3rd party apps"
+        ):
+            print("django-browser-reload added successfully to INSTALLED_APPS!")
+        print()
+
+    def add_to_middleware(self):
+        if self.settings_modifier.append_to_list(
+            "MIDDLEWARE",
+            ['"django_browser_reload.middleware.BrowserReloadMiddleware"'],
+            "needed for django-browser-reload",
+        ):
+            print("django-browser-reload added successfully to MIDDLEWARE!")
+        print()
+
+    def update_urls_py(self):
+        """changes the django project url file and adds django-browser-reload and also add include to the import statement"""
+        if os.path.exists(self.django_project_url_file):
+            with open(self.django_project_url_file, "r", encoding="utf-8") as url_file:
+                content = url_file.readlines()
+            if any("django_browser_reload.urls" in line for line in content):
+                print("django project urls.py already includes django-browser-reload")
+                return
+
+            django_urls_index = None
+            for i, line in enumerate(content):
+                if line.startswith("from django.urls"):
+                    django_urls_index = i
+                    break
+
+            if django_urls_index is not None:
+                content[django_urls_index] = "from django.urls import path, include\n"
+                print("'include' successfully added to import statement!")
+            else:
+                print("'include' could not be imported!")
+                exit(1)
+
+            new_lines = "\n# added for django-browser-reload\n"
+            new_lines += """urlpatterns.append(path("__reload__/", include("django_browser_reload.urls")))\n"""
+
+            content += new_lines
+
+            with open(self.django_project_url_file, "w", encoding="utf-8") as f:
+                f.write("".join(content))
+            print("django project urls.py UPDATED for django-browser-reload")
+        else:
+            print("Error adding django-browser-reload to urls.py")
+
+
+STATIC_STORAGE_TEMPLATE = '''"""
+Static files storage with hashed file names and precompressed .gz/.br files
+
+collectstatic saves every file under a name with the hash of its content, so
+the files can be cached forever, and writes a gzip and (if the brotli package
+is installed) a brotli compressed copy of the text files next to it. Files
+which were not collected (e.g. in tests) are served under their own name.
+"""
+
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSED_EXTENSIONS = (".css", ".js", ".map", ".svg", ".txt", ".html", ".json", ".xml")
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # files missing from staticfiles.json (tests, collectstatic not run yet) keep
+    # their own name instead of raising "Missing staticfiles manifest entry"
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            if hashed_name.endswith(COMPRESSED_EXTENSIONS):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, "rb") as f:
+            content = f.read()
+        variants = [(".gz", gzip.compress(content, 9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(content)))
+        for extension, compressed in variants:
+            # servers prefer the compressed file, it is only kept if it is smaller
+            if len(compressed) < len(content):
+                with open(path + extension, "wb") as f:
+                    f.write(compressed)
+'''
+
+
+class ProductionStaticInstaller:
+    """Hashed static file names (cache busting) and precompressed .gz/.br files
+
+    Writes <project>/storage.py with a ManifestStaticFilesStorage which also
+    compresses the collected files, and sets STATIC_ROOT and STORAGES.
+    """
+
+    # brotli is optional for storage.py, without it only .gz files are written
+    python_packages = ["brotli"]
+    static_root = "staticfiles"
+
+    def __init__(self, folder_path, settings_modifier, django_project_name) -> None:
+        self.folder_path = folder_path
+        self.settings_modifier = settings_modifier
+        self.django_project_name = django_project_name
+        self.create_storage()
+        self.update_settings()
+
+    def create_storage(self):
+        storage_file = os.path.join(
+            self.folder_path, self.django_project_name, "storage.py"
+        )
+        with open(storage_file, "w", encoding="utf-8") as f:
+            f.write(STATIC_STORAGE_TEMPLATE)
+        print(f"{self.django_project_name}/storage.py created successfully!")
+
+    def update_settings(self):
+        if "STORAGES" in self.settings_modifier.assignments:
+            print("STORAGES already set")
+            return
+        if self.settings_modifier.insert_after(
+            "STATIC_URL",
+            f'STATIC_ROOT = BASE_DIR / "{self.static_root}"\n'
+            "\n"
+            "STORAGES = {\n"
+            '    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},\n'
+            "    # hashed file names and precompressed .gz/.br files for production\n"
+            '    "staticfiles": {\n'
+            f'        "BACKEND": "{self.django_project_name}.storage.CompressedManifestStaticFilesStorage"\n'
+            "    },\n"
+            "}\n",
+        ):
+            print("STATIC_ROOT and STORAGES inserted successfully")
+        print()
+
+
+PRODUCTION_SETTINGS_TEMPLATE = '''"""
+Production settings of {project}, everything else comes from settings.py
+
+Used with DJANGO_SETTINGS_MODULE={project}.production, the secret key and the
+allowed hosts are read from the environment variables DJANGO_SECRET_KEY and
+DJANGO_ALLOWED_HOSTS (comma separated).
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403 pylint: disable=W0401,W0614
+from .settings import DATABASES, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",") if host
+]
+
+# Templates are parsed once per process and then served from memory
+TEMPLATES = [
+    {{
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {{
+            **TEMPLATES[0]["OPTIONS"],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        }},
+    }}
+]
+
+# Database connections are kept open for 10 minutes and checked before reuse
+DATABASES = {{
+    name: {{**database, "CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True}}
+    for name, database in DATABASES.items()
+}}
+'''
+
+
+class PerformanceProfileInstaller:
+    """Settings which most projects tune by hand sooner or later
+
+    Adds a cache backend (local memory or files) to settings.py and writes
+    <project>/production.py with DEBUG off, the cached template loader and
+    persistent, health-checked database connections.
+    """
+
+    cache_backends = {
+        "locmem": (
+            "django.core.cache.backends.locmem.LocMemCache",
+            '"{project}"',
+        ),
+        "file": (
+            "django.core.cache.backends.filebased.FileBasedCache",
+            'BASE_DIR / "django_cache"',
+        ),
+    }
+
+    def __init__(
+        self, folder_path, settings_modifier, django_project_name, cache_backend
+    ) -> None:
+        self.folder_path = folder_path
+        self.settings_modifier = settings_modifier
+        self.django_project_name = django_project_name
+        self.cache_backend = cache_backend
+        self.add_cache()
+        self.create_production_settings()
+
+    def add_cache(self):
+        if "CACHES" in self.settings_modifier.assignments:
+            print("CACHES already set")
+            return
+        backend, location = self.cache_backends[self.cache_backend]
+        if self.settings_modifier.insert_after(
+            "DATABASES",
+            "\n"
+            "CACHES = {\n"
+            '    "default": {\n'
+            f'        "BACKEND": "{backend}",\n'
+            f'        "LOCATION": {location.format(project=self.django_project_name)},\n'
+            "    }\n"
+            "}\n",
+        ):
+            print(f"CACHES ({self.cache_backend}) inserted successfully")
+
+    def create_production_settings(self):
+        production_file = os.path.join(
+            self.folder_path, self.django_project_name, "production.py"
+        )
+        with open(production_file, "w", encoding="utf-8") as f:
+            f.write(
+                PRODUCTION_SETTINGS_TEMPLATE.format(project=self.django_project_name)
+            )
+        print(f"{self.django_project_name}/production.py created successfully!")
+        print()
+
+
+class VendorAssetSync:
+    """Copies the vendored JS libraries from node_modules to static/ only if they changed
+
+    The files are listed in the "vendor" key of package.json. vendor-sync.js keeps a
+    manifest of their size, mtime and sha256, so a build copies nothing as long as
+    the libraries didn't change. It is a build step of its own, watch mode only
+    rebuilds the CSS.
+    """
+
+    script_name = "vendor-sync.js"
+    manifest_name = ".vendor-manifest.json"
+
+    def __init__(self, folder_path, package_json) -> None:
+        self.folder_path = folder_path
+        self.package_json = package_json
+
+    def install(self):
+        if not self.package_json.vendor_files:
+            print("No vendored JS libraries, vendor-sync.js is not needed.")
+            return
+        with open(
+            os.path.join(self.folder_path, self.script_name), "w", encoding="utf-8"
+        ) as file:
+            file.write(
+                f"""// Copies the JS libraries listed in the "vendor" key of package.json from
+// node_modules to static/, but only the ones which changed since the last run.
+const crypto = require("crypto");
+const fs = require("fs");
+const path = require("path");
+
+const manifestPath = "{self.manifest_name}";
+const vendor = require("./package.json").vendor || {{}};
+let manifest = {{}};
+try {{
+    manifest = JSON.parse(fs.readFileSync(manifestPath, "utf8"));
+}} catch (error) {{
+    // first run
+}}
+
+const sha256 = (file) =>
+    crypto.createHash("sha256").update(fs.readFileSync(file)).digest("hex");
+
+let changed = false;
+for (const [source, destination] of Object.entries(vendor)) {{
+    const stat = fs.statSync(source);
+    const entry = manifest[destination];
+    const exists = fs.existsSync(destination);
+    if (entry && exists && entry.size === stat.size && entry.mtimeMs === stat.mtimeMs) {{
+        continue;
+    }}
+    const hash = sha256(source);
+    if (!(entry && exists && entry.sha256 === hash && sha256(destination) === hash)) {{
+        fs.mkdirSync(path.dirname(destination), {{ recursive: true }});
+        fs.copyFileSync(source, destination);
+        console.log(`${{source}} -> ${{destination}}`);
+    }}
+    manifest[destination] = {{ source, size: stat.size, mtimeMs: stat.mtimeMs, sha256: hash }};
+    changed = true;
+}}
+if (changed) {{
+    fs.writeFileSync(manifestPath, JSON.stringify(manifest, null, 2) + "\\n");
+}}
+"""
+            )
+        # after the CSS build
+        self.package_json.add_build_step(f"node {self.script_name}", order=1)
+        print(f"{self.script_name} created successfully!")
+
+
+class AlpineJSInstaller:
+    # installed together with Tailwind CSS by TailwindInstaller, unless vendor_cache is given
+    npm_packages = ["alpinejs"]
+
+    def __init__(self, folder_path, package_json, vendor_cache=None) -> None:
+        self.folder_path = folder_path
+        self.package_json = package_json
+        self.vendor_cache = vendor_cache
+        self.install_alpine()
+
+    def install_alpine(self):
+        """Set up Alpine JS, the npm package was already installed by TailwindInstaller"""
+        print()
+        print("Setting up AlpineJS")
+        if self.vendor_cache is not None:
+            self.vendor_cache.copy("alpinejs", self.folder_path)
+            return
+        alpine_folder = os.path.join(self.folder_path, "static", "js", "alpine")
+        os.makedirs(alpine_folder, exist_ok=True)
+
+        self.package_json.add_vendor_file(
+            "node_modules/alpinejs/dist/cdn.min.js", "static/js/alpine/cdn.min.js"
+        )
+        print("package.json vendor file added!")
+
+
+class HTMXInstaller:
+    # installed together with Tailwind CSS by TailwindInstaller, unless vendor_cache is given
+    npm_packages = ["htmx.org"]
+
+    def __init__(self, folder_path, package_json, vendor_cache=None) -> None:
+        self.folder_path = folder_path
+        self.package_json = package_json
+        self.vendor_cache = vendor_cache
+        self.install_htmx()
+
+    def install_htmx(self):
+        """Set up HTMX, the npm package was already installed by TailwindInstaller"""
+        print()
+        print("Setting up HTMX")
+        if self.vendor_cache is not None:
+            self.vendor_cache.copy("htmx.org", self.folder_path)
+            return
+        htmx_folder = os.path.join(self.folder_path, "static", "js", "htmx")
+        os.makedirs(htmx_folder, exist_ok=True)
+
+        self.package_json.add_vendor_file(
+            "node_modules/htmx.org/dist/htmx.min.js", "static/js/htmx/htmx.min.js"
+        )
+        print("package.json vendor file added!")
+
+
+class CSSSizeReport:
+    """Sizes of the built main.min.css and a check that Tailwind purged the unused utilities
+
+    The raw size comes from a second build without cssnano (--env development),
+    or without --minify for the standalone Tailwind CSS, into a temporary folder. The purge check looks for classes in the CSS which
+    appear in none of the files of the Tailwind content globs (or main.css).
+    """
+
+    def __init__(self, folder_path, package_cache, standalone=False) -> None:
+        self.folder_path = folder_path
+        self.package_cache = package_cache
+        self.standalone = standalone
+
+    def raw_size(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            raw_css = os.path.join(temp_dir, "main.css")
+            if self.standalone:
+                command = TailwindStandalone.build_command(raw_css)
+            else:
+                command = [
+                    "npx",
+                    "postcss",
+                    CSSBuildCache.input_css,
+                    "-o",
+                    raw_css,
+                    "--env",
+                    "development",
+                ]
+            try:
+                run_command(
+                    command, cwd=self.folder_path, env=self.package_cache.npm_env()
+                )
+            except subprocess.CalledProcessError as e:
+                print(f"Error: {e}")
+                return None
+            return os.path.getsize(raw_css) if os.path.exists(raw_css) else None
+
+    @staticmethod
+    def css_classes(css):
+        # the selectors only: comments, declarations ('.5rem') and at-rules ('@media (...)') are removed
+        css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+        css = re.sub(r"\{[^{}]*\}", ",", css)
+        css = re.sub(r"@[^{]*\{", ",", css)
+        return {
+            re.sub(r"\\(.)", r"\1", name)
+            for name in re.findall(r"\.(-?[A-Za-z_\\](?:\\.|[\w-])*)", css)
+        }
+
+    def content_files(self):
+        files = set()
+        for pattern in CSSBuildCache.content_globs(self.folder_path):
+            matches = [
+                path
+                for path in glob.glob(
+                    os.path.join(self.folder_path, pattern), recursive=True
+                )
+                if os.path.isfile(path)
+            ]
+            if not matches:
+                print(
+                    f"Warning: The Tailwind content glob '{pattern}' matches no files."
+                )
+            files.update(matches)
+        return sorted(files)
+
+    def check_purge(self, css):
+        content_files = self.content_files()
+        tokens = set()
+        for path in content_files + [
+            os.path.join(self.folder_path, CSSBuildCache.input_css)
+        ]:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            tokens.update(re.split(r"[\s'\"`<>={};,()]+", text))
+            tokens.update(self.css_classes(text))
+        classes = self.css_classes(css)
+        unused = sorted(name for name in classes if name not in tokens)
+        if unused:
+            print(
+                f"Purge check: {len(unused)} of {len(classes)} classes are used in none "
+                f"of the {len(content_files)} content files: {', '.join(unused[:10])}"
+            )
+        else:
+            print(
+                f"Purge check: all {len(classes)} classes are used in the "
+                f"{len(content_files)} content files."
+            )
+
+    def run(self, built=True):
+        output_css = os.path.join(self.folder_path, CSSBuildCache.output_css)
+        if not os.path.exists(output_css):
+            return
+        with open(output_css, "rb") as f:
+            css = f.read()
+        # after a skipped build there is no raw size, a second build isn't worth it
+        raw = self.raw_size() if built else None
+        sizes = [
+            ("raw", raw),
+            ("minified", len(css)),
+            ("gzip", len(gzip.compress(css, 9))),
+        ]
+        if brotli is not None:
+            sizes.append(("brotli", len(brotli.compress(css))))
+        print(
+            "main.min.css: "
+            + ", ".join(
+                f"{name} {'-' if size is None else f'{size:,}'} bytes"
+                for name, size in sizes
+            )
+        )
+        self.check_purge(css.decode("utf-8", errors="replace"))
 
 
 class NPMRunBuild:
-    def __init__(self, folder_path) -> None:
-        print("Running 'npm run build' - Should not throw any errors!")
-        os.chdir(folder_path)
+    """'npm run build', or with css_build_command (the standalone Tailwind CSS) that command"""
+
+    def __init__(
+        self, folder_path, build_cache=None, size_report=None, css_build_command=None
+    ) -> None:
+        build_script = " ".join(css_build_command) if css_build_command else None
+        digest = (
+            build_cache.input_digest(folder_path, build_script) if build_cache else None
+        )
+        built = False
+        try:
+            if digest and build_cache.is_current(folder_path, digest):
+                print("main.min.css is up to date, the CSS build is skipped.")
+                self.sync_vendor_files(folder_path)
+            elif digest and build_cache.restore(folder_path, digest):
+                print("main.min.css restored from the build cache.")
+                self.sync_vendor_files(folder_path)
+            else:
+                built = True
+                start = time.perf_counter()
+                if css_build_command:
+                    print(f"Running '{build_script}'")
+                    run_command(css_build_command, cwd=folder_path)
+                else:
+                    print("Running 'npm run build' - Should not throw any errors!")
+                    run_command(
+                        [
+                            "npm",
+                            "run",
+                            "build",
+                        ],
+                        cwd=folder_path,
+                    )
+                print(f"CSS built in {time.perf_counter() - start:.2f}s.")
+                if digest:
+                    build_cache.save(folder_path, digest)
+                if css_build_command:
+                    self.sync_vendor_files(folder_path)
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {e}")
+            exit(1)
+        if size_report is not None:
+            size_report.run(built)
+
+    @staticmethod
+    def sync_vendor_files(folder_path):
+        """The part of 'npm run build' which doesn't build the CSS"""
+        if os.path.exists(os.path.join(folder_path, VendorAssetSync.script_name)):
+            run_command(["node", VendorAssetSync.script_name], cwd=folder_path)
+
+
+class FileChangeSource:
+    """Changed files below a folder, from inotify on Linux and by polling elsewhere
+
+    changes(timeout) waits at most timeout seconds and returns the relative paths
+    of all files changed since the last call, so bursts of events come as one batch.
+    """
+
+    # inotify(7) event masks
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+    IN_NONBLOCK = 0o4000
+
+    def __init__(self, folder_path, is_ignored, poll_interval=0.5, force_polling=False):
+        self.folder_path = folder_path
+        self.is_ignored = is_ignored
+        self.poll_interval = poll_interval
+        self.watches = {}
+        self.libc = None
+        if not force_polling and sys.platform.startswith("linux"):
+            try:
+                self.libc = ctypes.CDLL(None, use_errno=True)
+                self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+                if self.fd < 0:
+                    raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+                self.add_watches(folder_path)
+            except (AttributeError, OSError) as e:
+                print(f"inotify is not available ({e}), polling for changes.")
+                self.libc = None
+        if self.libc is None:
+            self.mtimes = self.scan()
+
+    @property
+    def mode(self):
+        return "inotify" if self.libc else f"polling every {self.poll_interval}s"
+
+    def walk(self):
+        for root, dirs, files in os.walk(self.folder_path):
+            dirs[:] = [
+                name
+                for name in dirs
+                if not self.is_ignored(
+                    os.path.relpath(os.path.join(root, name), self.folder_path)
+                )
+            ]
+            yield root, files
+
+    def add_watches(self, folder_path):
+        mask = (
+            self.IN_CLOSE_WRITE
+            | self.IN_MODIFY
+            | self.IN_CREATE
+            | self.IN_DELETE
+            | self.IN_MOVED_FROM
+            | self.IN_MOVED_TO
+        )
+        for root, dirs, _ in os.walk(folder_path):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), mask)
+            if wd < 0:
+                raise OSError(
+                    ctypes.get_errno(), f"inotify_add_watch failed for {root}"
+                )
+            self.watches[wd] = root
+            dirs[:] = [
+                name
+                for name in dirs
+                if not self.is_ignored(
+                    os.path.relpath(os.path.join(root, name), self.folder_path)
+                )
+            ]
+
+    def scan(self):
+        mtimes = {}
+        for root, files in self.walk():
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                mtimes[path] = (stat.st_mtime_ns, stat.st_size)
+        return mtimes
+
+    def changes(self, timeout):
+        if self.libc is None:
+            time.sleep(min(timeout, self.poll_interval))
+            mtimes = self.scan()
+            changed = {
+                path
+                for path in mtimes.keys() | self.mtimes.keys()
+                if mtimes.get(path) != self.mtimes.get(path)
+            }
+            self.mtimes = mtimes
+        else:
+            changed = set()
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+            while readable:
+                try:
+                    data = os.read(self.fd, 64 * 1024)
+                except BlockingIOError:
+                    break
+                offset = 0
+                while offset < len(data):
+                    wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                    name = data[offset + 16 : offset + 16 + length].rstrip(b"\0")
+                    offset += 16 + length
+                    if wd not in self.watches or not name:
+                        continue
+                    path = os.path.join(self.watches[wd], os.fsdecode(name))
+                    relative_path = os.path.relpath(path, self.folder_path)
+                    if self.is_ignored(relative_path):
+                        continue
+                    if mask & self.IN_ISDIR:
+                        if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                            # new folders (e.g. from a git checkout) are watched too
+                            self.add_watches(path)
+                    else:
+                        changed.add(path)
+        return sorted(
+            os.path.relpath(path, self.folder_path)
+            for path in changed
+            if not self.is_ignored(os.path.relpath(path, self.folder_path))
+        )
+
+
+class BuildWatcher:
+    """Rebuilds main.min.css when the Tailwind inputs change, like npm-watch but debounced
 
+    Changes are collected until none came in for the debounce time, so a save-all
+    or a git checkout cause one build instead of a burst of them. At most one
+    build runs, changes during a build are coalesced into at most one pending
+    build. Inputs which didn't really change are detected by the CSSBuildCache digest.
+    """
+
+    ignored_dirs = {"node_modules", ".git", ".venv", "__pycache__", "staticfiles"}
+    watched_extensions = (".html", ".js", ".css")
+
+    def __init__(self, folder_path, build_cache, debounce=0.2, force_polling=False):
+        self.folder_path = folder_path
+        self.build_cache = build_cache
+        self.debounce = debounce
+        self.force_polling = force_polling
+        self.condition = threading.Condition()
+        # (time of the first change, number of changed files) of the pending build
+        self.pending = None
+        self.coalesced = 0
+        self.results = []
+
+    def is_ignored(self, relative_path):
+        parts = relative_path.split(os.sep)
+        if parts[0] in self.ignored_dirs or parts[-1] == "__pycache__":
+            return True
+        if parts[0] == "static":
+            # the build output and the vendored libraries, only main.css is an input
+            return relative_path not in (
+                "static",
+                os.path.join("static", "css"),
+                CSSBuildCache.input_css,
+            )
+        if os.path.splitext(relative_path)[1]:
+            return not relative_path.endswith(self.watched_extensions)
+        return False
+
+    def build_command(self):
+        scripts = NodeModulesStore.read_json(
+            os.path.join(self.folder_path, "package.json")
+        ).get("scripts", {})
+        if TailwindStandalone.runs(scripts.get("build:css", "")):
+            # no Node (and npm) to start for every build
+            return scripts["build:css"].split()
+        return ["npm", "run", "build:css" if "build:css" in scripts else "build"]
+
+    def build(self):
+        digest = self.build_cache.input_digest(self.folder_path)
+        if self.build_cache.is_current(self.folder_path, digest):
+            return "unchanged"
+        if self.build_cache.restore(self.folder_path, digest):
+            return "restored"
         try:
-            subprocess.run(
-                [
-                    "npm",
-                    "run",
-                    "build",
-                ],
-                check=True,
+            run_command(self.build_command(), cwd=self.folder_path)
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {e}")
+            return "failed"
+        self.build_cache.save(self.folder_path, digest)
+        return "built"
+
+    def schedule(self, first_change, changed_files):
+        with self.condition:
+            if self.pending:
+                self.coalesced += 1
+                first_change = min(first_change, self.pending[0])
+                changed_files += self.pending[1]
+            self.pending = (first_change, changed_files)
+            self.condition.notify()
+
+    def build_loop(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                (first_change, changed_files), self.pending = self.pending, None
+            start = time.monotonic()
+            result = self.build()
+            end = time.monotonic()
+            self.results.append((result, end - first_change))
+            print(
+                f"[watch] {result}: {changed_files} changed file(s), build "
+                f"{(end - start) * 1000:.0f} ms, {(end - first_change) * 1000:.0f} ms "
+                "after the first change"
             )
+
+    def print_summary(self):
+        latencies = sorted(latency for _, latency in self.results)
+        if not latencies:
+            return
+        print(
+            f"[watch] {len(self.results)} build(s), "
+            f"{sum(1 for result, _ in self.results if result == 'built')} ran the CSS build, "
+            f"{self.coalesced} batch(es) coalesced, median latency "
+            f"{latencies[len(latencies) // 2] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms"
+        )
+
+    def run(self):
+        if not os.path.exists(os.path.join(self.folder_path, "package.json")):
+            print(f"Error: '{self.folder_path}' has no package.json.")
+            exit(1)
+        source = FileChangeSource(
+            self.folder_path, self.is_ignored, force_polling=self.force_polling
+        )
+        threading.Thread(target=self.build_loop, daemon=True).start()
+        print(
+            f"Watching '{self.folder_path}' ({source.mode}, debounce "
+            f"{self.debounce * 1000:.0f} ms), Ctrl+C to stop."
+        )
+        # brings main.min.css up to date first, like 'npm run build'
+        self.schedule(time.monotonic(), 0)
+        first_change = last_change = None
+        changed_files = set()
+        try:
+            while True:
+                if first_change is None:
+                    timeout = 1.0
+                else:
+                    timeout = max(0.0, last_change + self.debounce - time.monotonic())
+                changed = source.changes(timeout)
+                now = time.monotonic()
+                if changed:
+                    first_change = first_change or now
+                    last_change = now
+                    changed_files.update(changed)
+                elif first_change is not None and now - last_change >= self.debounce:
+                    self.schedule(first_change, len(changed_files))
+                    first_change = last_change = None
+                    changed_files = set()
+        except KeyboardInterrupt:
+            self.print_summary()
+
+
+class CollectStatic:
+    """Runs collectstatic, which hashes and compresses the static files, and prints their sizes"""
+
+    def __init__(self, folder_path, environment) -> None:
+        self.folder_path = folder_path
+        print("Running 'manage.py collectstatic'")
+        try:
+            environment.run(["python", "manage.py", "collectstatic", "--noinput"])
         except subprocess.CalledProcessError as e:
             print(f"Error: {e}")
             exit(1)
+        self.print_sizes()
+
+    def print_sizes(self):
+        static_root = os.path.join(
+            self.folder_path, ProductionStaticInstaller.static_root
+        )
+        manifest_path = os.path.join(static_root, "staticfiles.json")
+        if not os.path.exists(manifest_path):
+            print(
+                "collectstatic wrote no staticfiles.json, there are no sizes to report."
+            )
+            return
+        paths = NodeModulesStore.read_json(manifest_path)["paths"]
+        names = sorted(
+            name
+            for name in paths
+            if name.endswith((".css", ".js")) and not name.startswith("admin/")
+        )
+        if not names:
+            return
+        name_width = max(len("File"), *(len(paths[name]) for name in names))
+        print()
+        print(f"{'File':<{name_width}}  {'Raw':>9}  {'gzip':>9}  {'brotli':>9}")
+        for name in names:
+            path = os.path.join(static_root, paths[name])
+            sizes = [
+                (
+                    f"{os.path.getsize(file_path):>9}"
+                    if os.path.exists(file_path)
+                    else f"{'-':>9}"
+                )
+                for file_path in (path, path + ".gz", path + ".br")
+            ]
+            print(f"{paths[name]:<{name_width}}  {'  '.join(sizes)}")
+
+
+class TailwindContentDiscovery:
+    """Tailwind content globs for the templates of all local apps and of the project
+
+    Every local app of INSTALLED_APPS (a folder of the project) gets
+    './<app>/templates/**/*.html', every folder of TEMPLATES DIRS
+    './<folder>/**/*.html'. Tailwind only scans these folders, never the whole
+    project with node_modules and .venv.
+    """
+
+    excludes = ["!./**/node_modules/**"]
+
+    def __init__(self, folder_path, settings_file):
+        self.folder_path = folder_path
+        self.settings_modifier = DjangoSettingsModifier(settings_file)
+        self.settings_modifier.read_settings()
+
+    @staticmethod
+    def settings_file(folder_path):
+        """settings.py of an existing project, from DJANGO_SETTINGS_MODULE in manage.py"""
+        try:
+            with open(
+                os.path.join(folder_path, "manage.py"), "r", encoding="utf-8"
+            ) as f:
+                match = re.search(
+                    r"DJANGO_SETTINGS_MODULE['\"],\s*['\"]([\w.]+)['\"]", f.read()
+                )
+        except FileNotFoundError:
+            match = None
+        if match is None:
+            print(f"Error: No Django project found in '{folder_path}'.")
+            exit(1)
+        return os.path.join(folder_path, *match.group(1).split(".")) + ".py"
+
+    def list_items(self, name):
+        node = self.settings_modifier.assignments.get(name)
+        if node is None or not isinstance(node.value, (ast.List, ast.Tuple)):
+            return []
+        return node.value.elts
+
+    def app_dirs(self):
+        """Folders of the local apps, e.g. 'pages' for 'pages.apps.PagesConfig'"""
+        app_dirs = []
+        for item in self.list_items("INSTALLED_APPS"):
+            if not isinstance(item, ast.Constant) or not isinstance(item.value, str):
+                continue
+            parts = item.value.split(".")
+            # the deepest folder of the dotted path is the app
+            app_dir = None
+            for i in range(1, len(parts) + 1):
+                if not os.path.isdir(os.path.join(self.folder_path, *parts[:i])):
+                    break
+                app_dir = os.path.join(*parts[:i])
+            if app_dir is not None and app_dir not in app_dirs:
+                app_dirs.append(app_dir)
+        return app_dirs
+
+    def project_template_dirs(self):
+        """The folders of TEMPLATES DIRS inside the project, like BASE_DIR / 'templates'"""
+        template_dirs = []
+        for template in self.list_items("TEMPLATES"):
+            if not isinstance(template, ast.Dict):
+                continue
+            for key, value in zip(template.keys, template.values):
+                if not (isinstance(key, ast.Constant) and key.value == "DIRS"):
+                    continue
+                if not isinstance(value, (ast.List, ast.Tuple)):
+                    continue
+                for directory in value.elts:
+                    if (
+                        isinstance(directory, ast.BinOp)
+                        and isinstance(directory.op, ast.Div)
+                        and isinstance(directory.left, ast.Name)
+                        and directory.left.id == "BASE_DIR"
+                        and isinstance(directory.right, ast.Constant)
+                    ):
+                        template_dirs.append(directory.right.value)
+                    elif isinstance(directory, ast.Constant) and not os.path.isabs(
+                        directory.value
+                    ):
+                        template_dirs.append(directory.value)
+        return template_dirs
+
+    def template_dirs(self):
+        return [
+            os.path.join(app_dir, "templates").replace(os.sep, "/")
+            for app_dir in self.app_dirs()
+        ] + [
+            directory.strip("/").replace(os.sep, "/")
+            for directory in self.project_template_dirs()
+        ]
+
+    def globs(self):
+        """The content globs, the number of files each matches is printed"""
+        template_dirs = self.template_dirs()
+        globs = [f"./{directory}/**/*.html" for directory in template_dirs]
+        print("Tailwind content:")
+        total = 0
+        for pattern in globs:
+            files = glob.glob(os.path.join(self.folder_path, pattern), recursive=True)
+            total += len(files)
+            print(f"  {pattern}: {len(files)} files")
+        print(f"  {total} files scanned in {len(globs)} folders")
+        return globs + self.excludes
+
+
+class TailwindStandalone:
+    """The standalone Tailwind CSS CLI, one executable instead of Node and node_modules
+
+    The executable of the pinned version is downloaded once into the cache (and
+    checked against sha256sums.txt of the release) and hardlinked into bin/ of
+    every project. It inits tailwind.config.js, builds main.min.css (autoprefixer
+    built in, --minify instead of cssnano) and watches without starting Node.
+    """
+
+    version = "3.4.17"
+    release_url = "https://github.com/tailwindlabs/tailwindcss/releases/download/v{version}/{asset}"
+    platforms = {"linux": "linux", "darwin": "macos", "win32": "windows"}
+    machines = {
+        "x86_64": "x64",
+        "amd64": "x64",
+        "aarch64": "arm64",
+        "arm64": "arm64",
+        "armv7l": "armv7",
+    }
+
+    def __init__(self, cache_dir, package_cache):
+        self.cache_dir = os.path.join(cache_dir, "tailwind")
+        self.package_cache = package_cache
+
+    @classmethod
+    def asset(cls):
+        """Name of the release executable for this platform, e.g. 'tailwindcss-linux-x64'"""
+        system = cls.platforms.get(sys.platform)
+        machine = cls.machines.get(platform.machine().lower())
+        if system is None or machine is None:
+            return None
+        return f"tailwindcss-{system}-{machine}" + (
+            ".exe" if system == "windows" else ""
+        )
+
+    @classmethod
+    def executable(cls):
+        """Path of the executable in a project, the version is part of the build script"""
+        suffix = ".exe" if sys.platform == "win32" else ""
+        return os.path.join("bin", f"tailwindcss-{cls.version}{suffix}")
+
+    @classmethod
+    def build_command(cls, output_css=CSSBuildCache.output_css, minify=False):
+        command = [cls.executable(), "-i", CSSBuildCache.input_css, "-o", output_css]
+        return command + ["--minify"] if minify else command
+
+    @classmethod
+    def runs(cls, script):
+        """The npm script runs the standalone executable (and not postcss with Node)"""
+        return script.startswith(os.path.join("bin", "tailwindcss-"))
+
+    def cached_path(self):
+        return os.path.join(self.cache_dir, self.version, self.asset())
+
+    def download(self, asset):
+        url = self.release_url.format(version=self.version, asset=asset)
+        with urllib.request.urlopen(url, timeout=60) as response:
+            return response.read()
+
+    def fetch(self):
+        """Downloads the executable into the cache, unless it is there already"""
+        if self.asset() is None:
+            print(
+                f"Error: There is no standalone Tailwind CSS for {sys.platform} "
+                f"{platform.machine()}, use --tailwind-backend npm."
+            )
+            exit(1)
+        cached_path = self.cached_path()
+        if os.path.exists(cached_path):
+            return cached_path
+        if self.package_cache.offline:
+            print(f"Error: The standalone Tailwind CSS '{cached_path}' is not cached.")
+            print("Run 'fill-cache' on a machine with internet access first.")
+            exit(1)
+        print(
+            f"Downloading the standalone Tailwind CSS {self.version} ({self.asset()})"
+        )
+        try:
+            executable = self.download(self.asset())
+            checksums = self.download("sha256sums.txt").decode("utf-8")
+        except OSError as e:
+            print(f"Error: The standalone Tailwind CSS could not be downloaded: {e}")
+            exit(1)
+        # lines of 'sha256sum': '<hash>  <file name>'
+        expected = {
+            name.lstrip("*"): checksum
+            for checksum, name in (
+                line.split() for line in checksums.splitlines() if line.strip()
+            )
+        }.get(self.asset())
+        if expected != hashlib.sha256(executable).hexdigest():
+            print(
+                f"Error: The checksum of {self.asset()} doesn't match sha256sums.txt."
+            )
+            exit(1)
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        temp_path = f"{cached_path}.{os.getpid()}"
+        with open(temp_path, "wb") as f:
+            f.write(executable)
+        os.chmod(temp_path, 0o755)
+        os.replace(temp_path, cached_path)
+        return cached_path
+
+    def install(self, folder_path):
+        """Hardlinks the cached executable into bin/ of the project"""
+        cached_path = self.fetch()
+        executable = os.path.join(folder_path, self.executable())
+        os.makedirs(os.path.dirname(executable), exist_ok=True)
+        if os.path.exists(executable):
+            os.remove(executable)
+        try:
+            os.link(cached_path, executable)
+        except OSError:
+            shutil.copy2(cached_path, executable)
+        print(
+            f"Standalone Tailwind CSS {self.version} installed in {self.executable()}"
+        )
 
 
 class TailwindInstaller:
+    npm_dev_packages = [
+        "tailwindcss",
+        "postcss",
+        "postcss-cli",
+        "autoprefixer",
+        "npm-watch",
+        "prettier",  # new
+        "prettier-plugin-tailwindcss",  # new
+    ]
+    # the packages of the CSS build, the standalone Tailwind CSS needs none of them
+    build_npm_dev_packages = [
+        "tailwindcss",
+        "postcss",
+        "postcss-cli",
+        "autoprefixer",
+        "npm-watch",
+    ]
+    # --minify-css
+    minify_npm_dev_packages = ["cssnano"]
+
     def __init__(self, folder_path):
         self.folder_path = folder_path
 
-    def install_tailwind(self):
-        """Installs Tailwind CSS and tools locally"""
+    def install_tailwind(
+        self,
+        npm_dev_packages,
+        npm_packages,
+        package_cache,
+        node_modules_store=None,
+        lock_templates=None,
+    ):
+        """Installs Tailwind CSS, tools and all other planned npm packages locally
+
+        At most one 'npm install -D' and one 'npm install' are run, so the tree is
+        resolved and package-lock.json is written only once per dependency type.
+        With a lock template, 'npm ci' installs it without resolving at all.
+        With a node_modules_store, a tree installed before is only hardlinked.
+        """
         print()
         print("Install Tailwind CSS and tools locally")
-        os.chdir(self.folder_path)
+        env = package_cache.npm_env()
+        store_key = NodeModulesStore.packages_key(npm_dev_packages, npm_packages)
         try:
-            subprocess.run(
-                [
-                    "npm",
-                    "install",
-                    "-D",
-                    "tailwindcss",
-                    "postcss",
-                    "postcss-cli",
-                    "autoprefixer",
-                    "npm-watch",
-                    "prettier",  # new
-                    "prettier-plugin-tailwindcss",  # new
-                ],
-                check=True,
-            )
-            print("Tailwind CSS installed successfully!")
-            subprocess.run(
-                [
-                    "npx",
-                    "tailwindcss",
-                    "init",
-                ],
-                check=True,
+            start = time.perf_counter()
+            if node_modules_store is not None and node_modules_store.link(
+                store_key, self.folder_path
+            ):
+                print(
+                    f"Tailwind CSS linked from the store in {time.perf_counter() - start:.1f}s!"
+                )
+            else:
+                if lock_templates is not None and lock_templates.copy_npm(
+                    npm_dev_packages, npm_packages, self.folder_path
+                ):
+                    run_command(["npm", "ci"], cwd=self.folder_path, env=env)
+                else:
+                    self.npm_install(npm_dev_packages, npm_packages, env)
+                if node_modules_store is not None:
+                    node_modules_store.add(store_key, self.folder_path)
+                print(
+                    f"Tailwind CSS installed successfully in {time.perf_counter() - start:.1f}s!"
+                )
+        except subprocess.CalledProcessError as e:
+            print(f"Error: {e}")
+            exit(1)
+
+    def create_tailwind_config(self, package_cache, standalone=False):
+        """Creates tailwind.config.js with 'npx tailwindcss init' (or the standalone CLI)"""
+        if os.path.exists(os.path.join(self.folder_path, "tailwind.config.js")):
+            # 'tailwindcss init' refuses to overwrite it
+            print("tailwind.config.js already exists.")
+            return
+        if standalone:
+            command = [os.path.join(self.folder_path, TailwindStandalone.executable())]
+        else:
+            command = ["npx", "tailwindcss"]
+        try:
+            run_command(
+                [*command, "init"],
+                cwd=self.folder_path,
+                env=package_cache.npm_env(),
             )
-            print("Tailwind CSS NPX init successfully!")
+            print("Tailwind CSS init successfully!")
         except subprocess.CalledProcessError as e:
             print(f"Error: {e}")
             exit(1)
 
-    def update_tailwind_config(self, django_app_name):
-        """Updates tailwind.config.js file"""
+    def npm_install(self, npm_dev_packages, npm_packages, env, lock_only=False):
+        # --package-lock-only resolves and writes package-lock.json, without node_modules
+        options = ["--package-lock-only"] if lock_only else []
+        run_command(
+            ["npm", "install", *options, "-D", *npm_dev_packages],
+            cwd=self.folder_path,
+            env=env,
+        )
+        if npm_packages:
+            run_command(
+                ["npm", "install", *options, *npm_packages],
+                cwd=self.folder_path,
+                env=env,
+            )
+
+    def update_tailwind_config(self, content_globs):
+        """Sets the content globs in tailwind.config.js"""
         tailwind_config_path = os.path.join(self.folder_path, "tailwind.config.js")
         if os.path.exists(tailwind_config_path):
             with open(tailwind_config_path, "r", encoding="utf-8") as file:
-                lines = file.readlines()
+                config = file.read()
 
-            for i, line in enumerate(lines):
-                if "content:" in line:
-                    # Find the line with 'content' and append the content string
-                    lines[i] = (
-                        f"  content: ['./{django_app_name}/templates/{django_app_name}/*.html'],\n"
-                    )
-                    break
+            content = "".join(f"    '{pattern}',\n" for pattern in content_globs)
+            config = re.sub(
+                r"content:\s*\[.*?\]",
+                lambda match: f"content: [\n{content}  ]",
+                config,
+                count=1,
+                flags=re.DOTALL,
+            )
 
             with open(tailwind_config_path, "w", encoding="utf-8") as file:
-                file.write("".join(lines))
+                file.write(config)
             print("Tailwind config updated successfully!")
         else:
             print("tailwind.config.js file not found.")
 
-    def update_package_json(self, django_app_name):
-        """Updates package.json file"""
-        package_json_path = os.path.join(self.folder_path, "package.json")
-        if os.path.exists(package_json_path):
-            with open(package_json_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-
-            # Add the "scripts" key
-            data["scripts"] = {
-                "build": "postcss static/css/main.css -o static/css/main.min.css",
-                "watch": "npm-watch",
-            }
+    def update_package_json(
+        self, template_dirs, package_json, standalone=False, minify=False
+    ):
+        """Registers the Tailwind CSS build and the watch config on package.json"""
+        if standalone:
+            css_build = " ".join(TailwindStandalone.build_command(minify=minify))
+            package_json.add_build_step(css_build)
+            package_json.set_script("build:css", css_build)
+            # the standalone CLI watches the content globs itself
+            package_json.set_script("watch", f"{css_build} --watch")
+            print("package.json updated successfully!")
+            return
+        css_build = "postcss static/css/main.css -o static/css/main.min.css"
+        package_json.add_build_step(css_build)
+        # watch mode only rebuilds the CSS, the vendored JS doesn't change
+        package_json.set_script("build:css", css_build)
+        package_json.set_script("watch", "npm-watch")
 
-            # Add the "watch" key and sub-keys
-            data["watch"] = {
-                "build": {
-                    "patterns": [f"{django_app_name}"],
+        # Add the "watch" key and sub-keys
+        self.update_watch_patterns(template_dirs, package_json)
+        print("package.json updated successfully!")
+
+    @staticmethod
+    def update_watch_patterns(template_dirs, package_json):
+        """npm-watch rebuilds the CSS when a template in one of template_dirs changes"""
+        package_json.set(
+            "watch",
+            {
+                "build:css": {
+                    "patterns": template_dirs,
                     "extensions": "html",
                     "quiet": "false",
+                    # ms to wait for more changes (e.g. save all) before a build
+                    "delay": 200,
                 }
-            }
-
-            with open(package_json_path, "w", encoding="utf-8") as file:
-                json.dump(data, file, indent=2)
-            print("package.json updated successfully!")
-        else:
-            print("package.json file not found.")
+            },
+        )
 
     def create_and_setup_prettier_config(self):
         """Creates the .prettierrc file and sets needed configuration"""
@@ -575,72 +3836,844 @@ class TailwindInstaller:
         print(".prettierrc created and updated accordingly!")
 
 
-if __name__ == "__main__":
-    folder_name = input("Enter folder name for the Django app: ")
-    django_project_name = input("Enter Django project name (e.g. core): ")
-    django_app_name = input("Enter Django app name (e.g. pages): ")
-    install_django_browser_reload = input(
-        "Should Django-Browser-Reload be installed? [y/N] "
-    )
-    install_alpine = input("Should AlpineJS be installed? [y/N] ")
-    install_htmx = input("Should HTMX be installed? [y/N] ")
+class BatchScaffolder:
+    """Creates many projects from a manifest on a bounded pool of workers
+
+    Every project is created by its own run of this script, with the options of
+    the manifest as command line arguments and its output written to its own log.
+    """
+
+    # options of this run only, with --trace every project gets a trace file next to its log
+    run_options = ("resume", "trace")
+
+    def __init__(self, parser, manifest_path, jobs, log_dir=None):
+        self.parser = parser
+        self.manifest_path = manifest_path
+        self.jobs = jobs
+        self.log_dir = log_dir or os.path.join(
+            os.path.dirname(os.path.abspath(manifest_path)), "logs"
+        )
+
+    def load_manifest(self):
+        try:
+            if self.manifest_path.endswith(".toml"):
+                try:
+                    import tomllib  # pylint: disable=C0415
+                except ImportError:
+                    print("Error: TOML manifests need Python 3.11+, use JSON instead.")
+                    exit(1)
+                with open(self.manifest_path, "rb") as f:
+                    manifest = tomllib.load(f)
+            else:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+        except FileNotFoundError:
+            print(f"Error: Manifest '{self.manifest_path}' not found.")
+            exit(1)
+        return manifest.get("defaults", {}), manifest.get("projects", [])
+
+    def command_line(self, options):
+        """Turns the options of a project into the command line of this script"""
+        options = {key.replace("-", "_"): value for key, value in options.items()}
+        command = [sys.executable, os.path.abspath(__file__)]
+        for action in self.parser._actions:  # pylint: disable=W0212
+            if action.dest not in options or not action.option_strings:
+                continue
+            value = options.pop(action.dest)
+            if isinstance(action, argparse.BooleanOptionalAction):
+                command.append(action.option_strings[0 if value else 1])
+            elif action.nargs == 0:
+                if value:
+                    command.append(action.option_strings[0])
+            elif value is not None:
+                command += [action.option_strings[0], str(value)]
+        if options:
+            raise ValueError(f"unknown options {', '.join(sorted(options))}")
+        return command
+
+    def project_options(self, args, defaults, project):
+        # options given on the command line apply to all projects of the manifest
+        options = {
+            action.dest: getattr(args, action.dest)
+            for action in self.parser._actions  # pylint: disable=W0212
+            if action.option_strings
+            and action.dest != "help"
+            and action.dest not in self.run_options
+        }
+        options.update(defaults)
+        options.update(project)
+        for option in ("browser_reload", "alpine", "htmx"):
+            if options.get(option) is None:
+                options[option] = False
+        return options
+
+    def log_path(self, folder, extension=".log"):
+        # the whole folder path, 'a/site' and 'b/site' get logs of their own
+        name = os.path.normpath(folder).strip(os.sep).replace(os.sep, "--")
+        return os.path.join(self.log_dir, name + extension)
+
+    def create_project(self, options):
+        start = time.perf_counter()
+        log_path = self.log_path(options["folder"])
+        try:
+            command = self.command_line(options)
+        except ValueError as e:
+            return "failed", time.perf_counter() - start, str(e)
+        with open(log_path, "w", encoding="utf-8") as log_file:
+            result = subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                check=False,
+            )
+        status = "ok" if result.returncode == 0 else f"failed ({result.returncode})"
+        return status, time.perf_counter() - start, log_path
+
+    def run(self, args):
+        defaults, projects = self.load_manifest()
+        all_options = [self.project_options(args, defaults, p) for p in projects]
+        for options in all_options:
+            for option in ("folder", "project", "app"):
+                if not options.get(option):
+                    print(
+                        f"Error: '{option}' is missing for a project of the manifest."
+                    )
+                    exit(1)
+            if args.trace:
+                options["trace"] = self.log_path(options["folder"], ".trace.json")
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        start = time.perf_counter()
+        print(f"Creating {len(all_options)} projects, {self.jobs} at the same time")
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = list(pool.map(self.create_project, all_options))
+        total = time.perf_counter() - start
+
+        folder_width = max([len("Project")] + [len(o["folder"]) for o in all_options])
+        print()
+        print(f"{'Project':<{folder_width}}  {'Status':<12}  {'Time':>8}  Log")
+        for options, (status, duration, log_path) in zip(all_options, results):
+            print(
+                f"{options['folder']:<{folder_width}}  {status:<12}  {duration:>7.1f}s  {log_path}"
+            )
+        print(f"{'Total':<{folder_width}}  {'':<12}  {total:>7.1f}s")
+        if any(status != "ok" for status, _, _ in results):
+            exit(1)
+
+
+def plan_dependencies(
+    browser_reload,
+    alpine,
+    htmx,
+    production_static=False,
+    minify_css=False,
+    vendor_cache=False,
+    tailwind_standalone=False,
+):
+    """Plan all Python packages up front, so the environment backend only resolves once, and all npm
+    packages, so npm resolves once for dev and once for runtime packages"""
+    dependency_planner = DependencyPlanner()
+    dependency_planner.add_python_packages("django", "pytest")
+    if browser_reload:
+        dependency_planner.add_python_packages(
+            *DjangoBrowserReloadInstaller.python_packages
+        )
+    if production_static:
+        dependency_planner.add_python_packages(
+            *ProductionStaticInstaller.python_packages
+        )
+    if tailwind_standalone:
+        # the standalone CLI builds and watches, npm only installs the editor tools
+        dependency_planner.add_npm_packages(
+            *(
+                package
+                for package in TailwindInstaller.npm_dev_packages
+                if package not in TailwindInstaller.build_npm_dev_packages
+            ),
+            dev=True,
+        )
+    else:
+        dependency_planner.add_npm_packages(
+            *TailwindInstaller.npm_dev_packages, dev=True
+        )
+    if minify_css and not tailwind_standalone:
+        dependency_planner.add_npm_packages(
+            *TailwindInstaller.minify_npm_dev_packages, dev=True
+        )
+    # with the vendor cache, the JS libraries don't need npm
+    if alpine and not vendor_cache:
+        dependency_planner.add_npm_packages(*AlpineJSInstaller.npm_packages)
+    if htmx and not vendor_cache:
+        dependency_planner.add_npm_packages(*HTMXInstaller.npm_packages)
+    return dependency_planner
+
+
+def load_resume_options(args):
+    """Takes the options of an interrupted scaffold from the journal in its folder"""
+    if args.folder is None:
+        print("Error: --resume needs the --folder of the interrupted scaffold.")
+        exit(1)
+    journal = StepJournal(os.path.abspath(args.folder))
+    if not journal.exists():
+        print(f"Error: There is no interrupted scaffold in '{args.folder}'.")
+        exit(1)
+    journal.load()
+    for name, value in journal.data["options"].items():
+        setattr(args, name, value)
+    print(f"Resuming '{args.folder}' with the options it was started with.")
+
+
+def ask_missing_options(args):
+    """Asks for every option which was not given on the command line"""
+    if args.folder is None:
+        args.folder = input("Enter folder name for the Django app: ")
+    if args.project is None:
+        args.project = input("Enter Django project name (e.g. core): ")
+    if args.app is None:
+        args.app = input("Enter Django app name (e.g. pages): ")
+    if args.browser_reload is None:
+        args.browser_reload = (
+            input("Should Django-Browser-Reload be installed? [y/N] ").capitalize()
+            == "Y"
+        )
+    if args.alpine is None:
+        args.alpine = input("Should AlpineJS be installed? [y/N] ").capitalize() == "Y"
+    if args.htmx is None:
+        args.htmx = input("Should HTMX be installed? [y/N] ").capitalize() == "Y"
     print()
 
+
+def scaffold_project(args):
+    dependency_planner = plan_dependencies(
+        args.browser_reload,
+        args.alpine,
+        args.htmx,
+        args.production_static,
+        args.minify_css,
+        args.vendor_cache,
+        args.tailwind_backend == "standalone",
+    )
+    package_cache = PackageCache(args.cache_dir, offline=args.offline)
+    if args.offline:
+        package_cache.check_filled()
+    environment_backend = ENV_BACKENDS[args.env_backend]
+    if not environment_backend.available():
+        print(f"Error: The environment backend '{args.env_backend}' is not installed.")
+        exit(1)
+
     # Construct absolute paths
-    absolute_folder_path = os.path.abspath(folder_name)
+    absolute_folder_path = os.path.abspath(args.folder)
+    settings_file_path = os.path.join(absolute_folder_path, args.project, "settings.py")
 
     folder_creator = FolderCreator(absolute_folder_path)
-    folder_creator.create_folder()
-    folder_creator.create_readme()
-    folder_creator.create_virtualenv_and_django_project(
-        django_project_name, django_app_name
+    lock_templates = LockTemplates() if args.lock_templates else None
+    environment = environment_backend(
+        absolute_folder_path,
+        package_cache,
+        os.path.join(args.cache_dir, "env-timings.jsonl"),
     )
-    folder_creator.create_django_app_template_folders(django_app_name)
-    folder_creator.create_static_folders()
-    folder_creator.create_pylint_config()
-    folder_creator.create_postcss_config()
 
-    print("Folder created with README.md and Django project setup completed.")
+    base_envs = None
+    if args.base_env:
+        if BaseEnvironmentCache.available():
+            base_envs = BaseEnvironmentCache(args.cache_dir)
+            environment.venv_in_project = True
+        else:
+            print(
+                "Base environments can't be cloned on this platform, --base-env is ignored."
+            )
 
-    # Construct absolute path to settings.py
-    settings_file_path = os.path.join(
-        absolute_folder_path, django_project_name, "settings.py"
+    snapshot_cache = ProjectSnapshotCache(args.cache_dir)
+    snapshot_key = ProjectSnapshotCache.option_key(
+        {
+            "browser_reload": args.browser_reload,
+            "alpine": args.alpine,
+            "htmx": args.htmx,
+            "python_packages": dependency_planner.python_packages,
+            "npm_dev_packages": dependency_planner.npm_dev_packages,
+            "npm_packages": dependency_planner.npm_packages,
+            "env_backend": args.env_backend,
+            "production_static": args.production_static,
+            "performance_profile": args.performance_profile,
+            "cache_backend": args.cache_backend,
+            "minify_css": args.minify_css,
+            "vendor_cache": args.vendor_cache,
+            "tailwind_backend": args.tailwind_backend,
+        }
     )
-    new_app = f"{django_app_name}.apps.{django_app_name.capitalize()}Config"
-    new_time_zone = "Europe/Berlin"
-    new_language_code = "de"
-
-    settings_modifier = DjangoSettingsModifier(settings_file_path)
-    settings_modifier.read_settings()
-    settings_modifier.add_to_installed_apps(new_app)
-    settings_modifier.update_time_zone(new_time_zone)
-    settings_modifier.update_language_code(new_language_code)
-    settings_modifier.update_static_file_dir()
-    settings_modifier.write_settings()
-
-    # Install django-browser-reload
-    if install_django_browser_reload.capitalize() == "Y":
-        DjangoBrowserReloadInstaller(
-            absolute_folder_path, settings_file_path, django_project_name
+    journal = StepJournal(absolute_folder_path)
+    if args.resume:
+        journal.load()
+    elif journal.exists():
+        print(
+            f"Error: '{args.folder}' is an interrupted scaffold, continue it with --resume."
         )
+        exit(1)
     else:
-        print("django-browser-reload will NOT be installed!")
+        journal.start(args)
+
+    name_clash = (
+        snapshot_cache.name_clash(snapshot_key, args.project, args.app)
+        if args.snapshot and snapshot_cache.has(snapshot_key)
+        else None
+    )
+    if name_clash is not None:
+        print(f"The snapshot is not used, {name_clash}.")
+    elif args.snapshot and not args.resume and snapshot_cache.has(snapshot_key):
+        graph = TaskGraph()
+        graph.add_task("folder", folder_creator.create_folder)
+        graph.add_task(
+            "snapshot",
+            lambda: snapshot_cache.restore(
+                snapshot_key, absolute_folder_path, args.project, args.app
+            ),
+            ["folder"],
+        )
+        graph.add_task("readme", folder_creator.create_readme, ["snapshot"])
+        graph.add_task(
+            "virtualenv",
+            lambda: folder_creator.sync_virtualenv(environment, base_envs),
+            ["snapshot"],
+        )
+        graph.run()
+        print("Project created from snapshot.")
+        return
 
-    # Install Tailwind CSS
     tailwind_installer = TailwindInstaller(absolute_folder_path)
-    tailwind_installer.install_tailwind()
-    # Update tailwind.config.js
-    tailwind_installer.update_tailwind_config(django_app_name)
-    # Update package.json
-    tailwind_installer.update_package_json(django_app_name)
-    tailwind_installer.create_and_setup_prettier_config()
-
-    if install_alpine.capitalize() == "Y":
-        AlpineJSInstaller(absolute_folder_path)
+    node_modules_store = NodeModulesStore(args.cache_dir) if args.shared_store else None
+    # all steps queue their settings.py edits here, they are written at once at the end
+    settings_modifier = DjangoSettingsModifier(settings_file_path)
+    # ... and the same for the package.json changes of all Node steps
+    package_json = PackageJson(absolute_folder_path)
+    vendor_cache = (
+        VendorCache(args.cache_dir, package_cache) if args.vendor_cache else None
+    )
+
+    def modify_settings():
+        new_app = f"{args.app}.apps.{args.app.capitalize()}Config"
+        new_time_zone = "Europe/Berlin"
+        new_language_code = "de"
+
+        settings_modifier.read_settings()
+        settings_modifier.add_to_installed_apps(new_app)
+        settings_modifier.update_time_zone(new_time_zone)
+        settings_modifier.update_language_code(new_language_code)
+        settings_modifier.update_static_file_dir()
+
+    def install_browser_reload():
+        if args.browser_reload:
+            DjangoBrowserReloadInstaller(
+                absolute_folder_path, settings_modifier, args.project
+            )
+        else:
+            print("django-browser-reload will NOT be installed!")
+
+    def install_alpine_js():
+        if args.alpine:
+            AlpineJSInstaller(absolute_folder_path, package_json, vendor_cache)
+        else:
+            print("AlpineJS will NOT be installed!")
+
+    def install_production_static():
+        if args.production_static:
+            ProductionStaticInstaller(
+                absolute_folder_path, settings_modifier, args.project
+            )
+
+    def install_performance_profile():
+        if args.performance_profile:
+            PerformanceProfileInstaller(
+                absolute_folder_path,
+                settings_modifier,
+                args.project,
+                args.cache_backend,
+            )
+
+    def install_htmx_js():
+        if args.htmx:
+            HTMXInstaller(absolute_folder_path, package_json, vendor_cache)
+        else:
+            print("HTMX will NOT be installed!")
+
+    project_path = os.path.join(args.project, "settings.py")
+    standalone = args.tailwind_backend == "standalone"
+    # The Python and the Node toolchain don't depend on each other and run in parallel
+    graph = TaskGraph()
+    graph.add_task("folder", folder_creator.create_folder)
+    graph.add_task(
+        "readme", folder_creator.create_readme, ["folder"], outputs=["README.md"]
+    )
+    graph.add_task(
+        "pylint", folder_creator.create_pylint_config, ["folder"], outputs=[".pylintrc"]
+    )
+    graph.add_task(
+        "static",
+        folder_creator.create_static_folders,
+        ["folder"],
+        outputs=[CSSBuildCache.input_css],
+    )
+    if not standalone:
+        graph.add_task(
+            "postcss",
+            lambda: folder_creator.create_postcss_config(args.minify_css),
+            ["folder"],
+            outputs=["postcss.config.js"],
+        )
+    # Python: virtual environment, Django project and app, settings.py
+    graph.add_task(
+        "virtualenv",
+        lambda: folder_creator.create_virtualenv(
+            dependency_planner.python_packages, environment, lock_templates, base_envs
+        ),
+        ["folder"],
+        outputs=[environment.lock_file],
+    )
+    graph.add_task(
+        "django",
+        lambda: folder_creator.create_django_project(
+            args.project,
+            args.app,
+            environment,
+            native_skeleton=not args.django_admin,
+        ),
+        ["virtualenv"],
+        outputs=["manage.py", project_path, os.path.join(args.app, "apps.py")],
+    )
+    graph.add_task(
+        "templates",
+        lambda: folder_creator.create_django_app_template_folders(args.app),
+        ["django"],
+        outputs=[os.path.join(args.app, "templates", args.app)],
+    )
+    graph.add_task("settings", modify_settings, ["django"], in_memory=True)
+    graph.add_task(
+        "browser_reload", install_browser_reload, ["settings"], in_memory=True
+    )
+    graph.add_task(
+        "production_static", install_production_static, ["settings"], in_memory=True
+    )
+    graph.add_task(
+        "performance", install_performance_profile, ["settings"], in_memory=True
+    )
+    graph.add_task(
+        "write_settings",
+        settings_modifier.write_settings,
+        ["browser_reload", "production_static", "performance"],
+        outputs=[project_path],
+    )
+    # Node: npm packages, tailwind.config.js, package.json, .prettierrc
+    graph.add_task(
+        "tailwind",
+        lambda: tailwind_installer.install_tailwind(
+            dependency_planner.npm_dev_packages,
+            dependency_planner.npm_packages,
+            package_cache,
+            node_modules_store,
+            lock_templates,
+        ),
+        ["folder"],
+        outputs=["node_modules", "package-lock.json"],
+    )
+    if standalone:
+        # the CSS build doesn't wait for npm, which only installs the editor tools
+        graph.add_task(
+            "tailwind_cli",
+            lambda: TailwindStandalone(args.cache_dir, package_cache).install(
+                absolute_folder_path
+            ),
+            ["folder"],
+            outputs=[TailwindStandalone.executable()],
+        )
+    graph.add_task(
+        "tailwind_init",
+        lambda: tailwind_installer.create_tailwind_config(package_cache, standalone),
+        ["tailwind_cli" if standalone else "tailwind"],
+        outputs=["tailwind.config.js"],
+    )
+    # the content globs come from the apps and template folders of settings.py
+    graph.add_task(
+        "tailwind_config",
+        lambda: tailwind_installer.update_tailwind_config(
+            TailwindContentDiscovery(absolute_folder_path, settings_file_path).globs()
+        ),
+        ["tailwind_init", "write_settings", "templates"],
+        outputs=["tailwind.config.js"],
+    )
+    graph.add_task("package_json", package_json.read, ["tailwind"], in_memory=True)
+    graph.add_task(
+        "tailwind_scripts",
+        lambda: tailwind_installer.update_package_json(
+            TailwindContentDiscovery(
+                absolute_folder_path, settings_file_path
+            ).template_dirs(),
+            package_json,
+            standalone,
+            args.minify_css,
+        ),
+        ["package_json", "write_settings"],
+        in_memory=True,
+    )
+    graph.add_task(
+        "prettier",
+        tailwind_installer.create_and_setup_prettier_config,
+        ["tailwind"],
+        outputs=[".prettierrc"],
+    )
+    graph.add_task(
+        "alpine", install_alpine_js, ["package_json", "static"], in_memory=True
+    )
+    graph.add_task("htmx", install_htmx_js, ["package_json", "static"], in_memory=True)
+    graph.add_task(
+        "vendor_sync",
+        VendorAssetSync(absolute_folder_path, package_json).install,
+        ["alpine", "htmx"],
+        in_memory=True,
+    )
+    if vendor_cache is not None:
+        graph.add_task(
+            "vendor_lock",
+            lambda: vendor_cache.write_lock(absolute_folder_path),
+            ["alpine", "htmx"],
+            outputs=[VendorCache.lock_name],
+        )
+    graph.add_task(
+        "write_package_json",
+        package_json.write,
+        ["tailwind_scripts", "vendor_sync"],
+        outputs=["package.json"],
+    )
+    if standalone:
+        build_dependencies = ["static", "tailwind_config"]
+        if (args.alpine or args.htmx) and vendor_cache is None:
+            # vendor-sync.js copies the libraries out of node_modules
+            build_dependencies.append("write_package_json")
     else:
-        print("AlpineJS will NOT be installed!")
-    if install_htmx.capitalize() == "Y":
-        HTMXInstaller(absolute_folder_path)
+        build_dependencies = [
+            "static",
+            "postcss",
+            "tailwind_config",
+            "prettier",
+            "write_package_json",
+        ]
+    graph.add_task(
+        "build",
+        lambda: NPMRunBuild(
+            absolute_folder_path,
+            CSSBuildCache(args.cache_dir),
+            (
+                CSSSizeReport(absolute_folder_path, package_cache, standalone)
+                if args.minify_css
+                else None
+            ),
+            (
+                TailwindStandalone.build_command(minify=args.minify_css)
+                if standalone
+                else None
+            ),
+        ),
+        build_dependencies,
+        outputs=[CSSBuildCache.output_css],
+    )
+    if args.production_static:
+        graph.add_task(
+            "collectstatic",
+            lambda: CollectStatic(absolute_folder_path, environment),
+            ["build", "write_settings"],
+            outputs=[
+                os.path.join(ProductionStaticInstaller.static_root, "staticfiles.json")
+            ],
+        )
+    graph.run(journal)
+    journal.remove()
+
+    print("Folder created with README.md and Django project setup completed.")
+    if args.snapshot:
+        snapshot_cache.save(snapshot_key, absolute_folder_path, args.project, args.app)
+
+
+def fill_cache(args):
+    """Downloads the packages of all options into the local caches"""
+    dependency_planner = plan_dependencies(True, True, True, True, True)
+    package_cache = PackageCache(args.cache_dir)
+    package_cache.fill(dependency_planner, LockTemplates())
+    VendorCache(args.cache_dir, package_cache).fill()
+    if TailwindStandalone.asset() is not None:
+        TailwindStandalone(args.cache_dir, package_cache).fetch()
+        print(f"Standalone Tailwind CSS cached in '{args.cache_dir}'")
+
+
+def store_gc(args):
+    NodeModulesStore(args.cache_dir).gc()
+
+
+def refresh_locks(args):
+    environment_backend = ENV_BACKENDS[args.env_backend]
+    if not environment_backend.available():
+        print(f"Error: The environment backend '{args.env_backend}' is not installed.")
+        exit(1)
+    LockTemplates().refresh(
+        environment_backend, PackageCache(args.cache_dir, offline=args.offline)
+    )
+
+
+def env_report(args):
+    """Median seconds of every phase per environment backend, from env-timings.jsonl"""
+    timings_file = os.path.join(args.cache_dir, "env-timings.jsonl")
+    if not os.path.exists(timings_file):
+        print(f"No timings recorded yet in '{timings_file}'.")
+        return
+    phases = {}
+    with open(timings_file, "r", encoding="utf-8") as f:
+        for line in f:
+            run = json.loads(line)
+            offline = " (offline)" if run["offline"] else ""
+            for phase, seconds in run["timings"].items():
+                phases.setdefault(
+                    (run["backend"] + offline, run["action"], phase), []
+                ).append(seconds)
+    print(f"{'Backend':<18}  {'Action':<6}  {'Phase':<15}  {'Runs':>4}  {'Median':>7}")
+    for (backend, action, phase), seconds in sorted(phases.items()):
+        seconds.sort()
+        print(
+            f"{backend:<18}  {action:<6}  {phase:<15}  {len(seconds):>4}  "
+            f"{seconds[len(seconds) // 2]:>6.1f}s"
+        )
+
+
+def watch(args):
+    BuildWatcher(
+        os.path.abspath(args.folder_path),
+        CSSBuildCache(args.cache_dir),
+        debounce=args.debounce,
+        force_polling=args.poll,
+    ).run()
+
+
+def tailwind_content(args):
+    """Discovers the template folders of an existing project again, e.g. after startapp"""
+    folder_path = os.path.abspath(args.folder_path)
+    discovery = TailwindContentDiscovery(
+        folder_path, TailwindContentDiscovery.settings_file(folder_path)
+    )
+    TailwindInstaller(folder_path).update_tailwind_config(discovery.globs())
+    package_json = PackageJson(folder_path)
+    package_json.read()
+    TailwindInstaller.update_watch_patterns(discovery.template_dirs(), package_json)
+    package_json.write()
+
+
+def batch(args, parser):
+    BatchScaffolder(parser, args.manifest, args.jobs, args.log_dir).run(args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Creates a Django project with Tailwind CSS and optionally "
+        "django-browser-reload, AlpineJS and HTMX. Missing options are asked for."
+    )
+    parser.add_argument("--folder", help="folder name for the Django app")
+    parser.add_argument("--project", help="Django project name (e.g. core)")
+    parser.add_argument("--app", help="Django app name (e.g. pages)")
+    for option, name in (
+        ("browser-reload", "Django-Browser-Reload"),
+        ("alpine", "AlpineJS"),
+        ("htmx", "HTMX"),
+    ):
+        parser.add_argument(
+            f"--{option}",
+            action=argparse.BooleanOptionalAction,
+            help=f"install {name}",
+        )
+    parser.add_argument(
+        "--production-static",
+        action="store_true",
+        help="hashed static file names (ManifestStaticFilesStorage) and precompressed "
+        ".gz/.br files, collected into staticfiles/ with a size report",
+    )
+    parser.add_argument(
+        "--performance-profile",
+        action="store_true",
+        help="add a cache backend to settings.py and write <project>/production.py "
+        "(DEBUG off, cached template loader, persistent database connections)",
+    )
+    parser.add_argument(
+        "--cache-backend",
+        choices=list(PerformanceProfileInstaller.cache_backends),
+        default="locmem",
+        help="cache backend of --performance-profile: local memory or files in "
+        "django_cache/ (default: locmem)",
+    )
+    parser.add_argument(
+        "--minify-css",
+        action="store_true",
+        help="minify main.min.css with cssnano and print its raw, minified and "
+        "compressed size and a check that unused Tailwind classes were purged",
+    )
+    parser.add_argument(
+        "--tailwind-backend",
+        choices=["npm", "standalone"],
+        default="npm",
+        help="build the CSS with Tailwind CSS, PostCSS and npm-watch from npm, or with "
+        "the standalone Tailwind CSS executable (cached, no Node for the builds) "
+        "(default: npm)",
+    )
+    parser.add_argument(
+        "--vendor-cache",
+        action="store_true",
+        help="copy AlpineJS and HTMX (pinned versions) from a content-addressed cache "
+        "into static/js instead of installing them with npm, with their SRI hashes "
+        "in vendor.lock.json",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="install from the local wheel and npm caches without network access",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"folder of the local caches (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="clone the project from a snapshot of an earlier run with the same options "
+        "(and save one if there is none yet)",
+    )
+    parser.add_argument(
+        "--shared-store",
+        action="store_true",
+        help="hardlink node_modules from a content-addressed store shared by all projects",
+    )
+    parser.add_argument(
+        "--base-env",
+        action="store_true",
+        help="clone .venv from a cached base environment with the same Python and "
+        "locked packages instead of installing them (and save one if there is none yet)",
+    )
+    parser.add_argument(
+        "--django-admin",
+        action="store_true",
+        help="create the Django project and app with django-admin instead of the "
+        "bundled templates",
+    )
+    parser.add_argument(
+        "--env-backend",
+        choices=list(ENV_BACKENDS),
+        default="pipenv",
+        help="tool for the virtual environment: pipenv, venv (python -m venv and pip "
+        "with requirements.lock) or uv (default: pipenv)",
+    )
+    parser.add_argument(
+        "--lock-templates",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="install from the pinned lock files of lock_templates (pipenv sync, pip/uv "
+        "from requirements.lock) instead of resolving the packages, if there are some "
+        "for the options; npm only uses 'npm ci' with npm templates of refresh-locks, "
+        "none are shipped",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted scaffold in --folder with the options it was "
+        "started with, the steps finished before are skipped",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE_FILE",
+        help="print the time, commands and bytes written of every step and save "
+        "them as Chrome trace-event JSON",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser(
+        "fill-cache",
+        help="download the packages of all options into the local caches for --offline",
+    )
+    subparsers.add_parser(
+        "refresh-locks",
+        help="resolve the packages of every option combination again and save "
+        "them as lock templates (Python locks for the --env-backend)",
+    )
+    subparsers.add_parser(
+        "env-report",
+        help="compare the resolve and install times recorded for each --env-backend",
+    )
+    subparsers.add_parser(
+        "store-gc",
+        help="remove files of the --shared-store no project uses anymore",
+    )
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="create all projects of a JSON or TOML manifest in parallel",
+    )
+    batch_parser.add_argument(
+        "manifest",
+        help="'projects' list with the options of each project, "
+        "optional 'defaults' with options for all of them",
+    )
+    batch_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="number of projects created at the same time (default: 4)",
+    )
+    batch_parser.add_argument(
+        "--log-dir",
+        help="folder for the log of every project (default: logs next to the manifest)",
+    )
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="rebuild the CSS of a project on changes, debounced and at most one build "
+        "at a time (instead of 'npm run watch')",
+    )
+    watch_parser.add_argument("folder_path", help="folder of the project")
+    watch_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="seconds without changes before a build starts (default: 0.2)",
+    )
+    watch_parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="poll for changes instead of using inotify",
+    )
+    tailwind_content_parser = subparsers.add_parser(
+        "tailwind-content",
+        help="set the Tailwind content globs of a project to the template folders of "
+        "all its local apps again (e.g. after adding an app)",
+    )
+    tailwind_content_parser.add_argument("folder_path", help="folder of the project")
+    return parser
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.command == "batch":
+        batch(args, parser)
+    elif args.command == "fill-cache":
+        fill_cache(args)
+    elif args.command == "store-gc":
+        store_gc(args)
+    elif args.command == "refresh-locks":
+        refresh_locks(args)
+    elif args.command == "env-report":
+        env_report(args)
+    elif args.command == "watch":
+        watch(args)
+    elif args.command == "tailwind-content":
+        tailwind_content(args)
     else:
-        print("HTMX will NOT be installed!")
-    NPMRunBuild(absolute_folder_path)
+        if args.resume:
+            load_resume_options(args)
+        ask_missing_options(args)
+        try:
+            scaffold_project(args)
+        finally:
+            # also (and especially) when a step failed
+            if args.trace:
+                TRACER.print_summary()
+                TRACER.save_chrome_trace(args.trace)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# create_django_project.py is a script in the folder above, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
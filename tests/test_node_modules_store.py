@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+
+from create_django_project import NodeModulesStore
+
+
+def make_project(folder_path, files):
+    for relative_path, content in files.items():
+        path = os.path.join(folder_path, "node_modules", relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    with open(os.path.join(folder_path, "package.json"), "w", encoding="utf-8") as f:
+        json.dump({"name": "p", "devDependencies": {"tailwindcss": "^3.4.6"}}, f)
+    with open(
+        os.path.join(folder_path, "package-lock.json"), "w", encoding="utf-8"
+    ) as f:
+        json.dump({"name": "p", "packages": {"": {"name": "p"}}}, f)
+
+
+def store_contents(store):
+    objects = [
+        os.path.join(root, name)
+        for root, _, names in os.walk(store.objects_dir)
+        for name in names
+    ]
+    return len(objects), sorted(os.listdir(store.manifests_dir))
+
+
+def test_gc_keeps_files_of_existing_projects(tmp_path):
+    store = NodeModulesStore(str(tmp_path / "cache"))
+    make_project(str(tmp_path / "p1"), {"a/index.js": "a", "b/index.js": "b"})
+    store.add("tree1", str(tmp_path / "p1"))
+    store.gc()
+    assert store_contents(store) == (2, ["tree1.json"])
+
+
+def test_gc_removes_unused_files_and_their_trees(tmp_path):
+    store = NodeModulesStore(str(tmp_path / "cache"))
+    make_project(str(tmp_path / "p1"), {"a/index.js": "a", "b/index.js": "b"})
+    store.add("tree1", str(tmp_path / "p1"))
+    make_project(str(tmp_path / "p2"), {"a/index.js": "a", "c/index.js": "c"})
+    store.add("tree2", str(tmp_path / "p2"))
+    assert store_contents(store) == (3, ["tree1.json", "tree2.json"])
+
+    shutil.rmtree(tmp_path / "p1")
+    store.gc()
+    # a/index.js is still linked by p2
+    assert store_contents(store) == (2, ["tree2.json"])
+
+    shutil.rmtree(tmp_path / "p2")
+    store.gc()
+    assert store_contents(store) == (0, [])
+
+
+def test_link_from_the_store(tmp_path):
+    store = NodeModulesStore(str(tmp_path / "cache"))
+    make_project(str(tmp_path / "p1"), {"a/index.js": "a"})
+    store.add("tree1", str(tmp_path / "p1"))
+    os.makedirs(tmp_path / "p2")
+    assert store.link("tree1", str(tmp_path / "p2"))
+    assert os.path.samefile(
+        tmp_path / "p1" / "node_modules" / "a" / "index.js",
+        tmp_path / "p2" / "node_modules" / "a" / "index.js",
+    )
+    with open(tmp_path / "p2" / "package-lock.json", "r", encoding="utf-8") as f:
+        assert json.load(f)["name"] == "p2"
+    assert not store.link("tree2", str(tmp_path / "p2"))
@@ -0,0 +1,85 @@
+import pytest
+
+from create_django_project import DjangoSettingsModifier
+
+
+def edit(tmp_path, source, *edits):
+    settings_file = tmp_path / "settings.py"
+    settings_file.write_text(source, encoding="utf-8")
+    settings_modifier = DjangoSettingsModifier(str(settings_file))
+    settings_modifier.read_settings()
+    for name, *args in edits:
+        getattr(settings_modifier, name)(*args)
+    settings_modifier.write_settings()
+    content = settings_file.read_text(encoding="utf-8")
+    compile(content, str(settings_file), "exec")
+    return content
+
+
+def test_set_value_keeps_statements_on_the_same_line(tmp_path):
+    content = edit(
+        tmp_path,
+        'A = 1; TIME_ZONE = "UTC"  # zone\nB = 2\n',
+        ("update_time_zone", "Europe/Berlin"),
+    )
+    assert content == 'A = 1; TIME_ZONE = "Europe/Berlin"  # zone\nB = 2\n'
+
+
+def test_set_value_after_non_ascii_characters(tmp_path):
+    content = edit(
+        tmp_path,
+        'NAME = "Café"; LANGUAGE_CODE = "en-us"\n',
+        ("update_language_code", "de-de"),
+    )
+    assert content == 'NAME = "Café"; LANGUAGE_CODE = "de-de"\n'
+
+
+def test_insert_after_the_last_line_without_line_break(tmp_path):
+    content = edit(
+        tmp_path,
+        'STATIC_URL = "static/"',
+        ("insert_after", "STATIC_URL", 'STATIC_ROOT = "staticfiles"\n'),
+    )
+    assert content == 'STATIC_URL = "static/"\nSTATIC_ROOT = "staticfiles"\n'
+
+
+def test_insert_after_the_whole_line(tmp_path):
+    content = edit(
+        tmp_path,
+        'STATIC_URL = "static/"; MEDIA_URL = (\n    "media/"\n)\nDEBUG = True\n',
+        ("insert_after", "STATIC_URL", 'STATIC_ROOT = "staticfiles"\n'),
+    )
+    assert content == (
+        'STATIC_URL = "static/"; MEDIA_URL = (\n    "media/"\n)\n'
+        'STATIC_ROOT = "staticfiles"\nDEBUG = True\n'
+    )
+
+
+def test_append_to_list_in_one_pass(tmp_path):
+    content = edit(
+        tmp_path,
+        'INSTALLED_APPS = [\n    "django.contrib.admin"  # admin, auth\n]\n'
+        'TIME_ZONE = "UTC"\n',
+        ("add_to_installed_apps", "pages"),
+        ("append_to_list", "INSTALLED_APPS", ['"django_browser_reload"']),
+        ("update_time_zone", "Europe/Berlin"),
+    )
+    assert content == (
+        'INSTALLED_APPS = [\n    "django.contrib.admin",  # admin, auth\n'
+        '    # local apps\n    "pages",\n    "django_browser_reload",\n]\n'
+        'TIME_ZONE = "Europe/Berlin"\n'
+    )
+
+
+def test_append_to_list_skips_existing_items(tmp_path):
+    source = 'INSTALLED_APPS = ["pages"]\n'
+    assert edit(tmp_path, source, ("add_to_installed_apps", "pages")) == source
+
+
+def test_append_to_a_setting_which_is_no_list(tmp_path):
+    settings_file = tmp_path / "settings.py"
+    settings_file.write_text('INSTALLED_APPS = ["a"] + ["b"]\n', encoding="utf-8")
+    settings_modifier = DjangoSettingsModifier(str(settings_file))
+    settings_modifier.read_settings()
+    with pytest.raises(SystemExit):
+        settings_modifier.add_to_installed_apps("pages")
@@ -0,0 +1,134 @@
+import json
+import os
+
+from create_django_project import ProjectSnapshotCache
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_rename_identifiers_swaps_names_in_one_pass(tmp_path):
+    settings_file = str(tmp_path / "settings.py")
+    write(
+        settings_file,
+        'ROOT_URLCONF = "core.urls"\n'
+        'INSTALLED_APPS = ["django.core", "pages.apps.PagesConfig"]\n'
+        "# https://docs.djangoproject.com/en/5.2/core/\n",
+    )
+    ProjectSnapshotCache.rename_identifiers(
+        settings_file, {"core": "pages", "pages": "core"}, "pages", "core"
+    )
+    assert read(settings_file) == (
+        'ROOT_URLCONF = "pages.urls"\n'
+        'INSTALLED_APPS = ["django.core", "core.apps.CoreConfig"]\n'
+        "# https://docs.djangoproject.com/en/5.2/core/\n"
+    )
+
+
+def test_rename_identifiers_keeps_longer_names(tmp_path):
+    config_file = str(tmp_path / "tailwind.config.js")
+    write(config_file, 'content: ["./pages/templates/**", "./pages-old/**", "x.pages"]')
+    ProjectSnapshotCache.rename_identifiers(
+        config_file, {"core": "site", "pages": "blog"}, "pages", "blog"
+    )
+    assert read(config_file) == (
+        'content: ["./blog/templates/**", "./pages-old/**", "x.pages"]'
+    )
+
+
+def make_snapshot(snapshot_cache, key, folder, project, app):
+    project_path = os.path.join(snapshot_cache.path(key), "project")
+    write(
+        os.path.join(project_path, "manage.py"),
+        f'os.environ.setdefault("DJANGO_SETTINGS_MODULE", "{project}.settings")\n',
+    )
+    write(
+        os.path.join(project_path, project, "settings.py"),
+        'SECRET_KEY = "snapshot"\n'
+        f'ROOT_URLCONF = "{project}.urls"\n'
+        'INSTALLED_APPS = ["django.contrib.staticfiles", '
+        f'"{app}.apps.{app.capitalize()}Config"]\n'
+        'STATIC_URL = "static/"\n',
+    )
+    write(
+        os.path.join(project_path, app, "apps.py"),
+        f'class {app.capitalize()}Config(AppConfig):\n    name = "{app}"\n',
+    )
+    write(os.path.join(project_path, app, "templates", app, "index.html"), "")
+    write(os.path.join(project_path, "static", "css", "main.css"), "")
+    write(
+        os.path.join(project_path, "package.json"),
+        json.dumps({"name": folder, "scripts": {"build": "cp static/a static/b"}}),
+    )
+    write(
+        os.path.join(project_path, "package-lock.json"),
+        json.dumps(
+            {
+                "name": folder,
+                "packages": {"": {"name": folder}, "node_modules/static": {}},
+            },
+            indent=2,
+        )
+        + "\n",
+    )
+    write(
+        os.path.join(snapshot_cache.path(key), "snapshot.json"),
+        json.dumps({"folder": folder, "project": project, "app": app}),
+    )
+
+
+def test_restore_with_swapped_names(tmp_path):
+    snapshot_cache = ProjectSnapshotCache(str(tmp_path / "cache"))
+    make_snapshot(snapshot_cache, "key", "static", "core", "pages")
+    folder_path = str(tmp_path / "pages")
+    assert snapshot_cache.name_clash("key", "pages", "core") is None
+    snapshot_cache.restore("key", folder_path, "pages", "core")
+
+    assert sorted(os.listdir(folder_path)) == [
+        "core",
+        "manage.py",
+        "package-lock.json",
+        "package.json",
+        "pages",
+        "static",
+    ]
+    settings = read(os.path.join(folder_path, "pages", "settings.py"))
+    assert 'ROOT_URLCONF = "pages.urls"' in settings
+    assert '"django.contrib.staticfiles", "core.apps.CoreConfig"' in settings
+    assert 'STATIC_URL = "static/"' in settings
+    assert 'SECRET_KEY = "snapshot"' not in settings
+    assert read(os.path.join(folder_path, "core", "apps.py")) == (
+        'class CoreConfig(AppConfig):\n    name = "core"\n'
+    )
+    assert os.path.exists(
+        os.path.join(folder_path, "core", "templates", "core", "index.html")
+    )
+
+    # the folder name is only renamed in the npm package names
+    package_json = json.loads(read(os.path.join(folder_path, "package.json")))
+    assert package_json == {
+        "name": "pages",
+        "scripts": {"build": "cp static/a static/b"},
+    }
+    package_lock = read(os.path.join(folder_path, "package-lock.json"))
+    assert json.loads(package_lock) == {
+        "name": "pages",
+        "packages": {"": {"name": "pages"}, "node_modules/static": {}},
+    }
+    assert package_lock.endswith("}\n")
+
+
+def test_name_clash(tmp_path):
+    snapshot_cache = ProjectSnapshotCache(str(tmp_path / "cache"))
+    make_snapshot(snapshot_cache, "key", "site", "core", "pages")
+    assert snapshot_cache.name_clash("key", "blog", "blog") is not None
+    assert snapshot_cache.name_clash("key", "core", "static") is not None
+    assert snapshot_cache.name_clash("key", "site", "blog") is None
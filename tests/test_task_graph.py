@@ -0,0 +1,93 @@
+import argparse
+import threading
+
+import pytest
+
+from create_django_project import StepJournal, TaskGraph
+
+
+def new_journal(folder_path):
+    journal = StepJournal(folder_path)
+    journal.start(argparse.Namespace(**{name: None for name in StepJournal.options}))
+    return journal
+
+
+def test_steps_run_after_their_dependencies():
+    order = []
+    graph = TaskGraph()
+    graph.add_task("folder", lambda: order.append("folder"))
+    graph.add_task("env", lambda: order.append("env"), ["folder"])
+    graph.add_task("npm", lambda: order.append("npm"), ["folder"])
+    graph.add_task("settings", lambda: order.append("settings"), ["env", "npm"])
+    graph.run()
+    assert order[0] == "folder"
+    assert order[-1] == "settings"
+    assert sorted(order[1:3]) == ["env", "npm"]
+
+
+def test_unknown_dependency():
+    graph = TaskGraph()
+    with pytest.raises(ValueError):
+        graph.add_task("settings", lambda: None, ["env"])
+
+
+def test_failure_records_the_steps_still_running(tmp_path):
+    env_started = threading.Event()
+    npm_failed = threading.Event()
+
+    def env():
+        env_started.set()
+        # still running when npm fails
+        npm_failed.wait(5)
+
+    def npm():
+        env_started.wait(5)
+        npm_failed.set()
+        raise RuntimeError("npm install failed")
+
+    journal = new_journal(str(tmp_path))
+    graph = TaskGraph()
+    graph.add_task("env", env)
+    graph.add_task("npm", npm)
+    with pytest.raises(RuntimeError):
+        graph.run(journal)
+    assert journal.is_completed("env")
+    assert not journal.is_completed("npm")
+
+    calls = []
+    journal = StepJournal(str(tmp_path))
+    journal.load()
+    graph = TaskGraph()
+    graph.add_task("env", lambda: calls.append("env"))
+    graph.add_task("npm", lambda: calls.append("npm"))
+    graph.run(journal)
+    assert calls == ["npm"]
+
+
+def test_resume_runs_the_dependents_of_failed_steps(tmp_path):
+    journal = new_journal(str(tmp_path))
+    graph = TaskGraph()
+    graph.add_task("folder", lambda: None)
+    graph.add_task("env", lambda: exit(1), ["folder"])
+    graph.add_task("settings", lambda: None, ["env"])
+    with pytest.raises(SystemExit):
+        graph.run(journal)
+
+    calls = []
+    journal.load()
+    graph = TaskGraph()
+    graph.add_task("folder", lambda: calls.append("folder"))
+    graph.add_task("env", lambda: calls.append("env"), ["folder"])
+    graph.add_task("settings", lambda: calls.append("settings"), ["env"])
+    graph.run(journal)
+    assert calls == ["env", "settings"]
+
+
+def test_missing_outputs_run_the_step_again(tmp_path):
+    journal = new_journal(str(tmp_path))
+    journal.complete("npm")
+    calls = []
+    graph = TaskGraph()
+    graph.add_task("npm", lambda: calls.append("npm"), outputs=["node_modules"])
+    graph.run(journal)
+    assert calls == ["npm"]
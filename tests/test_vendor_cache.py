@@ -0,0 +1,108 @@
+import base64
+import hashlib
+import io
+import os
+import tarfile
+
+import pytest
+
+import create_django_project
+from create_django_project import PackageCache, VendorCache
+
+DIST_FILE = b"var htmx = {};\n"
+
+
+def sri(content):
+    return "sha384-" + base64.b64encode(hashlib.sha384(content).digest()).decode()
+
+
+@pytest.fixture
+def vendor_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        VendorCache,
+        "libraries",
+        {
+            "htmx.org": {
+                "version": "2.0.3",
+                "file": "dist/htmx.min.js",
+                "integrity": sri(DIST_FILE),
+                "static": "js/htmx/htmx.min.js",
+                "defer": False,
+            }
+        },
+    )
+    cache_dir = str(tmp_path / "cache")
+    return VendorCache(cache_dir, PackageCache(cache_dir))
+
+
+def fake_npm_pack(content, calls):
+    """A run_command which writes a tarball with content as the dist file"""
+
+    def run_command(command, cwd=None, env=None):
+        calls.append(command)
+        tarball = os.path.join(command[-1], "htmx.org-2.0.3.tgz")
+        with tarfile.open(tarball, "w:gz") as f:
+            info = tarfile.TarInfo("package/dist/htmx.min.js")
+            info.size = len(content)
+            f.addfile(info, io.BytesIO(content))
+
+    return run_command
+
+
+def test_download_matches_the_pin(vendor_cache, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        create_django_project, "run_command", fake_npm_pack(DIST_FILE, calls)
+    )
+    path, integrity = vendor_cache.get("htmx.org")
+    assert integrity == sri(DIST_FILE)
+    with open(path, "rb") as f:
+        assert f.read() == DIST_FILE
+    # a cache hit, no second download
+    assert vendor_cache.get("htmx.org") == (path, integrity)
+    assert len(calls) == 1
+
+
+def test_download_with_another_hash_is_refused(vendor_cache, monkeypatch):
+    monkeypatch.setattr(
+        create_django_project, "run_command", fake_npm_pack(b"evil();\n", [])
+    )
+    with pytest.raises(SystemExit):
+        vendor_cache.get("htmx.org")
+    assert not os.path.exists(vendor_cache.object_path(sri(DIST_FILE)))
+
+
+def test_damaged_cache_file_is_fetched_again(vendor_cache, monkeypatch):
+    object_path = vendor_cache.object_path(sri(DIST_FILE))
+    os.makedirs(os.path.dirname(object_path))
+    with open(object_path, "wb") as f:
+        f.write(b"damaged")
+    calls = []
+    monkeypatch.setattr(
+        create_django_project, "run_command", fake_npm_pack(DIST_FILE, calls)
+    )
+    vendor_cache.get("htmx.org")
+    assert len(calls) == 1
+    with open(object_path, "rb") as f:
+        assert f.read() == DIST_FILE
+
+
+def test_copy_and_lock(vendor_cache, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        create_django_project, "run_command", fake_npm_pack(DIST_FILE, [])
+    )
+    folder_path = str(tmp_path / "project")
+    vendor_cache.copy("htmx.org", folder_path)
+    vendor_cache.write_lock(folder_path)
+    with open(
+        os.path.join(folder_path, "static", "js", "htmx", "htmx.min.js"), "rb"
+    ) as f:
+        assert f.read() == DIST_FILE
+    assert os.path.exists(os.path.join(folder_path, VendorCache.lock_name))
+
+
+def test_every_library_is_pinned_to_a_sha384_hash():
+    for library in VendorCache.libraries.values():
+        algorithm, digest = library["integrity"].split("-", 1)
+        assert algorithm == "sha384"
+        assert len(base64.b64decode(digest)) == 48